@@ -0,0 +1,65 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.accounts.models import User, TokenUser, auth_version_cache_key
+
+AUTH_VERSION_CLAIM = 'ver'
+AUTH_VERSION_CACHE_TIMEOUT = 300
+
+
+class UserRefreshToken(RefreshToken):
+    """Refresh token whose access tokens carry the claims of ``StatelessJWTAuthentication``."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token['email'] = user.email
+        token[AUTH_VERSION_CLAIM] = user.auth_version
+        return token
+
+
+def get_auth_version(user_id):
+    """Return the current auth version of a user, or ``None`` if the user is gone."""
+    key = auth_version_cache_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        user = User.objects.filter(pk=user_id).only('password_version', 'is_active').first()
+        if user is None:
+            return None
+        version = user.auth_version
+        cache.set(key, version, getattr(settings, 'AUTH_VERSION_CACHE_TIMEOUT', AUTH_VERSION_CACHE_TIMEOUT))
+    return version
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that trusts the token claims instead of loading the user.
+
+    The ``ver`` claim is compared with the cached auth version of the user, so
+    a password change, deactivation or deletion still rejects the token.
+    Tokens issued without the claim are authenticated as before.
+    """
+
+    def get_user(self, validated_token):
+        version = validated_token.get(AUTH_VERSION_CLAIM)
+        if version is None:
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        if get_auth_version(user_id) != version:
+            raise AuthenticationFailed(_('Token is no longer valid'), code='token_revoked')
+        return TokenUser.from_claims(user_id, validated_token.get('email'))
+
+
+class StatelessJWTScheme(SimpleJWTScheme):
+    target_class = StatelessJWTAuthentication
@@ -0,0 +1,54 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.utils import timezone
+
+from apps.accounts.models import User
+
+LAST_LOGIN_UPDATE_INTERVAL = timedelta(hours=1)
+
+
+class EmailOrPhoneBackend(ModelBackend):
+    """Authenticate with an email or a phone number, looked up in one query."""
+
+    def authenticate(self, request, login=None, password=None, **kwargs):
+        if login is None or password is None:
+            return None
+        lookup = {'email': login} if '@' in login else {'phone_number': login}
+        user = User.objects.filter(**lookup).first()
+        if user is None:
+            # Hash anyway, so that unknown logins take as long as wrong passwords.
+            User().set_password(password)
+            return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
+
+
+class ConfigurablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2 with the work factor taken from ``PASSWORD_HASHER_ITERATIONS``.
+
+    Stored hashes are upgraded to the configured iterations on the next login.
+    Use the ``benchmark_password_hasher`` command to pick a value.
+    """
+
+    @property
+    def iterations(self):
+        return getattr(settings, 'PASSWORD_HASHER_ITERATIONS', PBKDF2PasswordHasher.iterations)
+
+
+def update_last_login(user):
+    """
+    Record a login, but write ``last_login`` at most once per
+    ``LAST_LOGIN_UPDATE_INTERVAL`` and without sending ``post_save``.
+    """
+    now = timezone.now()
+    interval = getattr(settings, 'LAST_LOGIN_UPDATE_INTERVAL', LAST_LOGIN_UPDATE_INTERVAL)
+    if user.last_login is not None and now - user.last_login < interval:
+        return False
+    User.objects.filter(pk=user.pk).update(last_login=now)
+    user.last_login = now
+    return True
@@ -12,6 +12,7 @@ class UserFilter(filters.FilterSet):
         fields = ['search']
 
     def filter_search(self, queryset, _, value):
-        return queryset.filter(
-            Q(first_name__icontains=value) | Q(last_name__icontains=value) | Q(bio__icontains=value)
-        )
+        # Every word has to match the first or the last name; both are trigram indexed.
+        for word in value.split():
+            queryset = queryset.filter(Q(first_name__icontains=word) | Q(last_name__icontains=word))
+        return queryset
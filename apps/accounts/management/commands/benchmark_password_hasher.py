@@ -0,0 +1,24 @@
+import time
+
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Measure how long the password hasher takes, to tune PASSWORD_HASHER_ITERATIONS'
+
+    def add_arguments(self, parser):
+        parser.add_argument('iterations', nargs='*', type=int, help='Iteration counts to try instead of the current one')
+        parser.add_argument('--rounds', type=int, default=10, help='Hashes per measurement')
+
+    def handle(self, *args, **options):
+        hasher = get_hasher()
+        if not hasattr(hasher, 'iterations'):
+            raise CommandError(f'{hasher.algorithm} has no iteration count to tune')
+        iterations_list = options['iterations'] or [hasher.iterations]
+        for iterations in iterations_list:
+            started = time.perf_counter()
+            for _ in range(options['rounds']):
+                hasher.encode('benchmark-password', hasher.salt(), iterations)
+            elapsed = (time.perf_counter() - started) / options['rounds']
+            self.stdout.write(f'{hasher.algorithm} {iterations} iterations: {elapsed * 1000:.1f} ms per hash')
@@ -1,9 +1,39 @@
+from django.apps import apps
 from django.contrib.auth.models import BaseUserManager
+from django.db import models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.contrib.auth.models import Group
 
 
-class UserManager(BaseUserManager):
+class UserQuerySet(models.QuerySet):
+
+    def with_teacher_stats(self):
+        """
+        Annotate every user with the number of courses they teach and of distinct
+        students enrolled in them, so ``User.course_count`` and
+        ``User.student_count`` do not run queries per row.
+        """
+        course_model = apps.get_model('course', 'Course')
+        enrollment_model = apps.get_model('course', 'Enrollment')
+        courses = course_model.objects.filter(teacher=OuterRef('pk')).order_by().values('teacher')
+        enrollments = enrollment_model.objects.filter(course__teacher=OuterRef('pk')).order_by().values('course__teacher')
+
+        return self.annotate(
+            _course_count=self._subquery_value(courses, Count('id')),
+            _student_count=self._subquery_value(enrollments, Count('user', distinct=True)),
+        )
+
+    @staticmethod
+    def _subquery_value(queryset, aggregate):
+        return Coalesce(
+            Subquery(queryset.annotate(value=aggregate).values('value')), 0,
+            output_field=models.IntegerField()
+        )
+
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
 
     def _create_user(self, email, password, is_staff, is_superuser, **extra_fields):
         if not email:
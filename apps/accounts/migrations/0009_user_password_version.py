@@ -0,0 +1,18 @@
+# Generated by Django 5.0.4 on 2026-10-18 13:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_user_name_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='password_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -1,12 +1,33 @@
+import hashlib
 import uuid
 from datetime import date
+from functools import cached_property
 from typing import Optional
 
-from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.conf import settings
+from django.contrib.auth.models import AbstractUser, Group
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.core.cache import cache
+from django.db import models, router
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.db.models.functions import Upper
+from django.dispatch import receiver
 
+from config.cache import invalidate_tags
 from .managers import UserManager
 
+ROLES_CACHE_TIMEOUT = 300
+# User fields embedded in course payloads as the teacher.
+TEACHER_PAYLOAD_FIELDS = frozenset({'email', 'first_name', 'last_name', 'gender', 'profile_picture', 'is_assistant'})
+
+
+def roles_cache_key(user_id):
+    return f'user-roles:{user_id}'
+
+
+def auth_version_cache_key(user_id):
+    return f'user-auth-version:{user_id}'
+
 
 class User(AbstractUser):
 
@@ -22,6 +43,7 @@ class User(AbstractUser):
     phone_number = models.CharField(max_length=20, null=True, unique=True)
     profile_picture = models.ImageField(upload_to='profiles/', null=True, blank=True)
     is_assistant = models.BooleanField(default=False)
+    password_version = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
     username = None
@@ -34,6 +56,11 @@ class User(AbstractUser):
         ordering = ('-created_at',)
         verbose_name = 'user'
         verbose_name_plural = 'users'
+        indexes = [
+            # Trigram indexes serve the case-insensitive substring search of UserFilter.
+            GinIndex(OpClass(Upper('first_name'), name='gin_trgm_ops'), name='users_first_name_trgm'),
+            GinIndex(OpClass(Upper('last_name'), name='gin_trgm_ops'), name='users_last_name_trgm'),
+        ]
 
     @property
     def age(self) -> Optional[int]:
@@ -45,5 +72,104 @@ class User(AbstractUser):
             return age
         return None
 
+    @property
+    def course_count(self) -> int:
+        if hasattr(self, '_course_count'):
+            return self._course_count
+        return self.courses.count()
+
+    @property
+    def student_count(self) -> int:
+        if hasattr(self, '_student_count'):
+            return self._student_count
+        return User.objects.filter(enrollments__course__teacher=self).distinct().count()
+
+    @cached_property
+    def roles(self) -> frozenset:
+        """Names of the user's groups, read once per instance and cached between requests."""
+        key = roles_cache_key(self.pk)
+        roles = cache.get(key)
+        if roles is None:
+            roles = frozenset(self.groups.values_list('name', flat=True))
+            cache.set(key, roles, getattr(settings, 'USER_ROLES_CACHE_TIMEOUT', ROLES_CACHE_TIMEOUT))
+        return roles
+
+    @property
+    def auth_version(self) -> str:
+        """Changes whenever the password or the active state changes, which revokes issued tokens."""
+        return hashlib.sha256(f'{self.password_version}:{self.is_active}'.encode()).hexdigest()[:16]
+
+    def save(self, *args, **kwargs):
+        # ``_password`` is only set by ``set_password``, not by the hash
+        # upgrade of ``check_password``, so a rehash keeps the auth version.
+        if self._password is not None:
+            self.password_version += 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'password_version'}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return self.email
+
+
+class TokenUser(User):
+    """
+    User built from access token claims without a query. The fields that are
+    not in the token are loaded together the first time one of them is read.
+    """
+
+    class Meta:
+        proxy = True
+
+    @classmethod
+    def from_claims(cls, user_id, email):
+        values = {'id': uuid.UUID(str(user_id)), 'email': email, 'is_active': True}
+        field_names = [field.attname for field in cls._meta.concrete_fields if field.attname in values]
+        return cls.from_db(router.db_for_read(cls), field_names, [values[name] for name in field_names])
+
+    def refresh_from_db(self, using=None, fields=None):
+        deferred_fields = self.get_deferred_fields()
+        if fields is not None and set(fields) <= deferred_fields:
+            fields = list(deferred_fields)
+        super().refresh_from_db(using=using, fields=fields)
+
+
+# Receivers of user changes are also bound to ``TokenUser``: saving a proxy
+# sends the signals with the proxy class as the sender.
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=TokenUser)
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=TokenUser)
+def user_auth_version_signal(sender, instance, **kwargs):
+    cache.delete(auth_version_cache_key(instance.pk))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=TokenUser)
+def teacher_cache_signal(sender, instance, created, update_fields=None, **kwargs):
+    # Courses embed their teacher; deleting a teacher deletes the courses too.
+    if created or update_fields is not None and not update_fields & TEACHER_PAYLOAD_FIELDS:
+        return
+    if instance.courses.exists():
+        invalidate_tags('teachers')
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def user_groups_changed_signal(sender, instance, action, reverse, model, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear', 'pre_clear'):
+        return
+    if not reverse:
+        user_ids = [instance.pk]
+    elif action == 'pre_clear':
+        user_ids = list(instance.user_set.values_list('pk', flat=True))
+    else:
+        user_ids = pk_set or []
+    cache.delete_many([roles_cache_key(user_id) for user_id in user_ids])
+
+
+@receiver(post_save, sender=Group)
+@receiver(pre_delete, sender=Group)
+def group_changed_signal(sender, instance, **kwargs):
+    cache.delete_many([roles_cache_key(user_id) for user_id in instance.user_set.values_list('pk', flat=True)])
@@ -1,5 +1,4 @@
 from django.contrib.auth import authenticate
-from django.contrib.auth.models import update_last_login
 from django.contrib.auth.password_validation import validate_password
 
 from rest_framework import serializers
@@ -8,6 +7,8 @@ from rest_framework.validators import UniqueValidator
 from rest_framework_simplejwt.serializers import PasswordField
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from apps.accounts.authentication import UserRefreshToken
+from apps.accounts.backends import update_last_login
 from apps.accounts.models import User
 
 
@@ -18,13 +19,7 @@ class LoginSerializer(serializers.Serializer):
     access = serializers.CharField(read_only=True, min_length=200, max_length=300)
 
     def validate(self, attrs):
-        login = attrs.get('login')
-        password = attrs.get('password')
-        if '@' in login:
-            user = authenticate(email=login, password=password)
-        else:
-            user = User.objects.filter(phone_number=login).first()
-            user = authenticate(email=user.email if user else None, password=password)
+        user = authenticate(self.context.get('request'), login=attrs.get('login'), password=attrs.get('password'))
 
         if not user:
             raise AuthenticationFailed(detail='Invalid login or password')
@@ -37,12 +32,12 @@ class LoginSerializer(serializers.Serializer):
             'refresh': str(refresh),
             'access': str(refresh.access_token)
         }
-        update_last_login(None, user)
+        update_last_login(user)
         return data
 
     @staticmethod
     def get_token(user) -> RefreshToken:
-        return RefreshToken.for_user(user)
+        return UserRefreshToken.for_user(user)
 
 
 class RegisterSerializer(serializers.ModelSerializer):
@@ -80,7 +75,7 @@ class RegisterSerializer(serializers.ModelSerializer):
         )
         user.set_password(validated_data['password'])
         user.save()
-        refresh: RefreshToken = RefreshToken.for_user(user)
+        refresh: RefreshToken = UserRefreshToken.for_user(user)
         user.refresh = str(refresh)
         user.access = str(refresh.access_token)
         return user
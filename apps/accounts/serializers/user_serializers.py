@@ -20,8 +20,8 @@ class UserListSerializer(serializers.ModelSerializer):
 
 
 class TeacherSerializer(UserSerializer):
-    course_count = serializers.SerializerMethodField(read_only=True)
-    student_count = serializers.SerializerMethodField(read_only=True)
+    course_count = serializers.IntegerField(read_only=True)
+    student_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = User
@@ -29,9 +29,3 @@ class TeacherSerializer(UserSerializer):
             'id', 'email', 'first_name', 'last_name', 'gender', 'profile_picture',
             'is_assistant', 'course_count', 'student_count'
         ]
-
-    def get_course_count(self, obj) -> int:
-        return obj.courses.count()
-
-    def get_student_count(self, obj) -> int:
-        return User.objects.filter(enrollments__course__teacher=obj).count()
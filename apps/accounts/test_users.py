@@ -0,0 +1,179 @@
+from unittest import mock
+
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.course.models import Category, Color, Course, Enrollment
+from config.permissons import IsAdmin, IsAdminOrAuth
+
+User = get_user_model()
+
+
+class UserRolesTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='user@example.com', password='password!123')
+        self.admin_group = Group.objects.create(name='admin')
+
+    def fresh_user(self):
+        return User.objects.get(pk=self.user.pk)
+
+    def test_roles_are_cached(self):
+        self.assertEqual(self.fresh_user().roles, frozenset())
+        user = self.fresh_user()
+        with self.assertNumQueries(0):
+            self.assertFalse(IsAdmin().has_permission(mock.Mock(user=user), None))
+            self.assertFalse(IsAdminOrAuth().has_permission(mock.Mock(user=user, method='POST'), None))
+
+    def test_group_changes_invalidate_roles(self):
+        self.assertEqual(self.fresh_user().roles, frozenset())
+        self.user.groups.add(self.admin_group)
+        self.assertEqual(self.fresh_user().roles, {'admin'})
+
+        self.admin_group.user_set.remove(self.user)
+        self.assertEqual(self.fresh_user().roles, frozenset())
+
+        self.admin_group.user_set.add(self.user)
+        self.assertEqual(self.fresh_user().roles, {'admin'})
+        self.admin_group.delete()
+        self.assertEqual(self.fresh_user().roles, frozenset())
+
+
+class StatelessJWTAuthenticationTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='user@example.com', password='password!123', first_name='Test')
+        response = self.client.post(reverse('login'), {'login': 'user@example.com', 'password': 'password!123'})
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + response.data['access'])
+
+    def test_user_is_built_from_claims(self):
+        self.client.get(reverse('notification-summary'))
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('notification-summary'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_other_fields_load_together(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('profile'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['first_name'], 'Test')
+
+    def test_password_change_revokes_token(self):
+        self.client.get(reverse('notification-summary'))
+        response = self.client.post(reverse('change-password'), {
+            'old_password': 'password!123', 'password': 'new-password!123', 'password2': 'new-password!123'
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get(reverse('notification-summary'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(
+        PASSWORD_HASHERS=[
+            'apps.accounts.backends.ConfigurablePBKDF2PasswordHasher', 'django.contrib.auth.hashers.MD5PasswordHasher'
+        ],
+        PASSWORD_HASHER_ITERATIONS=1000,
+    )
+    def test_password_rehash_keeps_token(self):
+        self.client.get(reverse('notification-summary'))
+        response = self.client.post(reverse('login'), {'login': 'user@example.com', 'password': 'password!123'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(User.objects.get(pk=self.user.pk).password.startswith('pbkdf2_sha256$1000$'))
+        response = self.client.get(reverse('notification-summary'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_profile_delete_revokes_token(self):
+        self.client.get(reverse('notification-summary'))
+        self.assertEqual(self.client.delete(reverse('profile')).status_code, status.HTTP_204_NO_CONTENT)
+        response = self.client.get(reverse('notification-summary'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token_without_version_claim(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+        response = self.client.get(reverse('notification-summary'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class LoginTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='user@example.com', password='password!123', phone_number='+998901234567'
+        )
+        self.url = reverse('login')
+
+    def login(self, login, password='password!123'):
+        return self.client.post(self.url, {'login': login, 'password': password})
+
+    def test_login_with_email_or_phone(self):
+        for login in 'user@example.com', '+998901234567':
+            response = self.login(login)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertIn('access', response.data)
+        self.assertEqual(self.login('+998900000000').status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.login('user@example.com', 'wrong').status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_user_is_read_once_and_last_login_is_throttled(self):
+        # The user lookup, the outstanding refresh token and the last_login update.
+        User.objects.filter(pk=self.user.pk).update(last_login=None)
+        with self.assertNumQueries(3):
+            self.login('+998901234567')
+        last_login = User.objects.get(pk=self.user.pk).last_login
+        self.assertIsNotNone(last_login)
+
+        with self.assertNumQueries(2):
+            self.login('+998901234567')
+        self.assertEqual(User.objects.get(pk=self.user.pk).last_login, last_login)
+
+
+class TeacherListTests(APITestCase):
+
+    def setUp(self):
+        self.teacher_group = Group.objects.create(name='teacher')
+        self.category = Category.objects.create(name='Category')
+        self.color = Color.objects.create(name='Red', hex_code='#FF0000')
+        self.students = [
+            User.objects.create_user(email=f'student{num}@example.com', password='password!123') for num in range(3)
+        ]
+        self.url = reverse('teacher-list')
+
+    def create_teacher(self, first_name, last_name, course_count=2):
+        teacher = User.objects.create_user(
+            email=f'{first_name}@example.com', password='password!123', first_name=first_name, last_name=last_name
+        )
+        teacher.groups.add(self.teacher_group)
+        for num in range(course_count):
+            course = Course.objects.create(
+                title=f'Course {num}', description='Description', category=self.category, teacher=teacher,
+                color1=self.color, color2=self.color, lesson_price=100
+            )
+            for student in self.students:
+                Enrollment.objects.create(user=student, course=course)
+        return teacher
+
+    def test_counts_are_annotated(self):
+        self.create_teacher('John', 'Smith')
+        self.create_teacher('Jane', 'Doe', course_count=1)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(
+            [(teacher['course_count'], teacher['student_count']) for teacher in response.data['results']],
+            [(2, 3), (1, 3)]
+        )
+
+        teacher = User.objects.get(first_name='John')
+        self.assertEqual((teacher.course_count, teacher.student_count), (2, 3))
+
+    def test_search_matches_every_word_in_names(self):
+        self.create_teacher('John', 'Smith')
+        self.create_teacher('Jane', 'Doe')
+        for search, names in ('jo', ['John']), ('smith jo', ['John']), ('j', ['John', 'Jane']), ('jo doe', []):
+            response = self.client.get(self.url, {'search': search})
+            self.assertEqual([teacher['first_name'] for teacher in response.data['results']], names)
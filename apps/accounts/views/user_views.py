@@ -1,5 +1,4 @@
 from django.contrib.auth.models import Group
-from django.db.models import Prefetch
 from drf_spectacular.types import OpenApiTypes
 from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import AllowAny
@@ -11,7 +10,7 @@ from drf_spectacular.utils import extend_schema, OpenApiParameter
 from apps.accounts.filters import UserFilter
 from apps.accounts.serializers import UserSerializer, TeacherSerializer, RegisterSerializer
 from apps.accounts.models import User
-from apps.course.models import Course
+from config.pagination import CursorPaginationMixin, paginated
 from config.permissons import IsAdminOrReadOnly, IsAuth
 
 TEACHER_MANUAL_PARAMETERS = [
@@ -94,26 +93,24 @@ class UserProfileAPIView(APIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class TeacherListAPIView(APIView):
+class TeacherListAPIView(CursorPaginationMixin, APIView):
     serializer_class = TeacherSerializer
     permission_classes = IsAdminOrReadOnly,
+    ordering = 'created_at', 'id'
 
     @extend_schema(
-        responses={200: TeacherSerializer},
+        responses={200: paginated(TeacherSerializer)},
         parameters=TEACHER_MANUAL_PARAMETERS,
         tags=['Teacher'],
         description='Get teacher list'
     )
     def get(self, request):
-        teachers = User.objects.filter(groups__name='teacher').prefetch_related(
-            Prefetch('courses', queryset=Course.objects.all())
-        ).prefetch_related(
-            Prefetch('enrollments__course__teacher', queryset=User.objects.all())
-        ).order_by('created_at')
+        teachers = User.objects.filter(groups__name='teacher').with_teacher_stats()
         user_filter = UserFilter(data=request.GET, request=request, queryset=teachers)
         filtered_teachers = user_filter.qs if user_filter.is_valid() else teachers.none()
-        serializer = self.serializer_class(filtered_teachers, many=True, context={'request': request})
-        return Response(serializer.data)
+        page = self.paginate_queryset(filtered_teachers)
+        serializer = self.serializer_class(page, many=True, context={'request': request})
+        return self.get_paginated_response(serializer.data)
 
     @extend_schema(
         request=RegisterSerializer,
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.4 on 2026-10-18 13:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('banner', '0002_alter_banner_discount'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='banner',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+    ]
@@ -1,6 +1,10 @@
 import uuid
 
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from config.cache import invalidate_tags
 
 
 class Banner(models.Model):
@@ -10,10 +14,16 @@ class Banner(models.Model):
     link = models.CharField(max_length=255, null=True)
     image = models.ImageField(upload_to='banner/')
     discount = models.PositiveSmallIntegerField(null=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
     class Meta:
         db_table = 'banner'
         verbose_name = 'banner'
         verbose_name_plural = 'banners'
         ordering = ['-created_at']
+
+
+@receiver(post_save, sender=Banner)
+@receiver(post_delete, sender=Banner)
+def banner_cache_signal(sender, instance, **kwargs):
+    invalidate_tags('banners')
@@ -5,22 +5,27 @@ from rest_framework.views import APIView
 
 from apps.banner.models import Banner
 from apps.banner.serializers import BannerSerializer
+from config.cache import cache_response
+from config.pagination import CursorPaginationMixin, paginated
 from config.permissons import IsAdminOrReadOnly
 
 
-class BannerView(APIView):
+class BannerView(CursorPaginationMixin, APIView):
     serializer_class = BannerSerializer
     permission_classes = IsAdminOrReadOnly,
+    ordering = '-created_at', '-id'
 
     @extend_schema(
         tags=['Banner'],
-        responses={200: serializer_class(many=True)},
+        responses={200: paginated(serializer_class)},
         description="Get all banners"
     )
+    @cache_response('banners')
     def get(self, request):
         banners = Banner.objects.all()
-        serializer = self.serializer_class(banners, many=True, context={'request': request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        page = self.paginate_queryset(banners)
+        serializer = self.serializer_class(page, many=True, context={'request': request})
+        return self.get_paginated_response(serializer.data)
 
     @extend_schema(
         tags=['Banner'],
@@ -2,7 +2,7 @@ import base64
 import json
 from urllib.parse import urlunparse
 
-from asgiref.sync import sync_to_async
+from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
 from django.core.files.base import ContentFile
 from django.http import HttpRequest
@@ -40,17 +40,21 @@ class ChatConsumer(AsyncWebsocketConsumer):
 
         if not self.chat or not self.scope['user'].is_authenticated:
             await self.close()
+            return
 
         self.room_group_name = 'chat_%s' % self.chat_id
         await self.channel_layer.group_add(self.room_group_name, self.channel_name)
-        await self.accept()
+        await self.accept(subprotocol=self.scope.get('auth_subprotocol'))
 
     async def disconnect(self, close_code):
+        if self.room_group_name is None:
+            return
         await self.channel_layer.group_discard(self.room_group_name, self.channel_name)
 
     async def receive(self, text_data=None, bytes_data=None):
         text_data_json = json.loads(text_data)
         message_text = text_data_json.get('message')
+        media_ids = text_data_json.get('media_ids', None)
         media_data_list = text_data_json.get('media', None)
         message_type = text_data_json.get('type')
         message = await Message.objects.acreate(
@@ -60,33 +64,38 @@ class ChatConsumer(AsyncWebsocketConsumer):
             type=message_type
         )
 
+        if media_ids:
+            await MessageMedia.objects.filter(
+                id__in=media_ids, chat=self.chat, uploader=self.user, message__isnull=True
+            ).aupdate(message=message)
         if media_data_list:
-            for media_data in media_data_list:
-                file_str, file_name = media_data['data'], media_data['file_name']
-                media_file = ContentFile(base64.b64decode(file_str), name=file_name)
-                await MessageMedia.objects.acreate(
-                    message=message,
-                    file=media_file,
-                )
+            await self.save_media(message, media_data_list)
 
         await self.channel_layer.group_send(
             self.room_group_name,
             {
                 'type': 'chat_message',
-                'message': message
+                'message': await self.serialize_message(message)
             }
         )
 
     async def chat_message(self, event):
-        message = event['message']
-        message_serializer = await sync_to_async(MessageSerializer)(message, context={
-            'request': CustomHttpRequest(self.scope)
-        })
-        message_data = await sync_to_async(lambda: message_serializer.data)()
-        await self.send(text_data=json.dumps({
-            'message': message_data,
-            'user': self.user.email
-        }))
+        # The message is already JSON, so every subscriber only wraps it.
+        await self.send(text_data='{"message": %s, "user": %s}' % (event['message'], json.dumps(self.user.email)))
+
+    @database_sync_to_async
+    def save_media(self, message, media_data_list):
+        # Inline base64 attachments are still accepted, but decoded and written
+        # in a worker thread. New clients upload to the chat media endpoint.
+        for media_data in media_data_list:
+            file_str, file_name = media_data['data'], media_data['file_name']
+            media_file = ContentFile(base64.b64decode(file_str), name=file_name)
+            MessageMedia.objects.create(message=message, chat=self.chat, uploader=self.user, file=media_file)
+
+    @database_sync_to_async
+    def serialize_message(self, message):
+        serializer = MessageSerializer(message, context={'request': CustomHttpRequest(self.scope)})
+        return json.dumps(serializer.data)
 
     @staticmethod
     async def get_chat(chat_id):
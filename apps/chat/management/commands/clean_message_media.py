@@ -0,0 +1,24 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.chat.models import MessageMedia
+
+
+class Command(BaseCommand):
+    help = 'Delete uploaded message media that was never attached to a message'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=24, help='Only delete uploads older than this')
+
+    def handle(self, *args, **options):
+        created_before = timezone.now() - timedelta(hours=options['hours'])
+        orphans = MessageMedia.objects.filter(message__isnull=True, created_at__lt=created_before)
+        count = 0
+        for media in orphans.iterator():
+            media.file.delete(save=False)
+            media.delete()
+            count += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Deleted {count} unattached upload(s)'))
@@ -1,3 +1,9 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs
+
 import jwt
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
@@ -5,33 +11,131 @@ from django.conf import settings
 from channels.db import database_sync_to_async
 from channels.middleware import BaseMiddleware
 
+from apps.accounts.authentication import AUTH_VERSION_CLAIM, get_auth_version
+
 User = get_user_model()
 
+TOKEN_SUBPROTOCOL = 'bearer'
+USER_CACHE_TTL = 60
+USER_CACHE_SIZE = 10000
+
+
+class TokenUserCache:
+    """
+    Users resolved from access tokens, kept for a short time in this process.
+
+    Entries expire after ``ttl`` seconds or with the token, whichever comes
+    first, and the least recently used ones are dropped beyond ``size``.
+    """
+
+    def __init__(self, ttl, size):
+        self.ttl = ttl
+        self.size = size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token):
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            user, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+        return copy.copy(user)
+
+    def set(self, token, user, token_expires_at=None):
+        ttl = self.ttl
+        if token_expires_at is not None:
+            ttl = min(ttl, token_expires_at - time.time())
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[token] = copy.copy(user), time.monotonic() + ttl
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def evict_user(self, user_id):
+        with self._lock:
+            for token in [token for token, (user, _) in self._entries.items() if user.pk == user_id]:
+                del self._entries[token]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = TokenUserCache(
+    ttl=getattr(settings, 'WEBSOCKET_USER_CACHE_TTL', USER_CACHE_TTL),
+    size=getattr(settings, 'WEBSOCKET_USER_CACHE_SIZE', USER_CACHE_SIZE),
+)
+
 
 @database_sync_to_async
-def get_user(token):
+def get_user_by_id(user_id):
     try:
-        user_id = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.SIMPLE_JWT['ALGORITHM']])['user_id']
-    except jwt.exceptions.DecodeError:
+        return User.objects.get(id=user_id, is_active=True)
+    except User.DoesNotExist:
+        return None
+
+
+async def get_user(token):
+    """
+    Resolve the user of an access token. Like ``StatelessJWTAuthentication``,
+    tokens whose ``ver`` claim no longer matches the user's auth version are
+    rejected, also when the user is cached.
+    """
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.SIMPLE_JWT['ALGORITHM']])
+    except jwt.exceptions.InvalidTokenError:
         return AnonymousUser()
-    except jwt.ExpiredSignatureError:
+    user_id = payload.get('user_id')
+    if user_id is None:
         return AnonymousUser()
-    try:
-        return AnonymousUser() if user_id is None else User.objects.get(id=user_id)
-    except User.DoesNotExist:
+    version = payload.get(AUTH_VERSION_CLAIM)
+    if version is not None and await database_sync_to_async(get_auth_version)(user_id) != version:
         return AnonymousUser()
 
+    user = user_cache.get(token)
+    if user is not None:
+        return user
+    user = await get_user_by_id(user_id)
+    if user is None:
+        return AnonymousUser()
+    user_cache.set(token, user, payload.get('exp'))
+    return user
+
+
+def get_token(scope):
+    """
+    Read the access token from the ``Authorization`` header, the ``token``
+    query parameter or the ``bearer, <token>`` websocket subprotocols, which
+    are the only options browsers have.
+    """
+    headers = dict(scope['headers'])
+    if b'authorization' in headers:
+        token_type, _, token = headers[b'authorization'].decode().partition(' ')
+        return token if token_type == 'Bearer' and token else None
+
+    query = parse_qs(scope.get('query_string', b'').decode())
+    if query.get('token'):
+        return query['token'][0]
+
+    subprotocols = scope.get('subprotocols') or []
+    if TOKEN_SUBPROTOCOL in subprotocols:
+        index = subprotocols.index(TOKEN_SUBPROTOCOL)
+        if index + 1 < len(subprotocols):
+            scope['auth_subprotocol'] = TOKEN_SUBPROTOCOL
+            return subprotocols[index + 1]
+    return None
+
 
 class JwtAuthMiddleware(BaseMiddleware):
     async def __call__(self, scope, receive, send):
-        headers = dict(scope['headers'])
-        if b'authorization' in headers:
-            decoded = headers[b'authorization'].decode()
-            if decoded.startswith('Bearer '):
-                token_name, token_key = decoded.split()
-                scope['user'] = await get_user(token_key)
-            else:
-                scope['user'] = AnonymousUser()
-        else:
-            scope['user'] = AnonymousUser()
+        scope = dict(scope)
+        token = get_token(scope)
+        scope['user'] = await get_user(token) if token else AnonymousUser()
         return await super().__call__(scope, receive, send)
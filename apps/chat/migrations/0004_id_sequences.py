@@ -0,0 +1,15 @@
+# Generated by Django 5.0.4 on 2026-10-18 13:10
+
+import config.utils
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0003_rename_media_messagemedia_file'),
+    ]
+
+    operations = [
+        config.utils.create_id_sequences('chat'),
+    ]
@@ -1,6 +1,10 @@
 from django.db import models
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
-from apps.accounts.models import User
+from apps.accounts.models import TokenUser, User
+from apps.chat.middleware import user_cache
 from config.utils import CustomIDField
 
 
@@ -18,6 +22,38 @@ class Chat(models.Model):
         ordering = ('-created_at',)
 
 
+class MessageQuerySet(models.QuerySet):
+
+    def before(self, message):
+        return self.filter(
+            Q(created_at__lt=message.created_at) | Q(created_at=message.created_at, id__lt=message.id)
+        ).order_by('-created_at', '-id')
+
+    def after(self, message):
+        return self.filter(
+            Q(created_at__gt=message.created_at) | Q(created_at=message.created_at, id__gt=message.id)
+        ).order_by('created_at', 'id')
+
+    def window(self, before=None, after=None, size=50):
+        """
+        Return up to ``size`` messages in chronological order and whether more
+        messages exist beyond them: the latest ones by default, otherwise the
+        ones right before or after the given message.
+        """
+        if after is not None:
+            messages = self.after(after)
+        elif before is not None:
+            messages = self.before(before)
+        else:
+            messages = self.order_by('-created_at', '-id')
+        messages = list(messages[:size + 1])
+        has_more = len(messages) > size
+        messages = messages[:size]
+        if after is None:
+            messages.reverse()
+        return messages, has_more
+
+
 class Message(models.Model):
 
     class Type(models.TextChoices):
@@ -34,16 +70,21 @@ class Message(models.Model):
     type = models.CharField(max_length=10, choices=Type)
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
+    objects = MessageQuerySet.as_manager()
+
     class Meta:
         db_table = 'messages'
         verbose_name = 'message'
         verbose_name_plural = 'messages'
         ordering = ('created_at',)
+        indexes = [models.Index(fields=['chat', 'created_at', 'id'], name='message_chat_created_idx')]
 
 
 class MessageMedia(models.Model):
     id = CustomIDField(primary_key=True, editable=False)
-    message = models.ForeignKey(Message, related_name='media', on_delete=models.CASCADE, db_index=True)
+    message = models.ForeignKey(Message, related_name='media', on_delete=models.CASCADE, db_index=True, null=True)
+    chat = models.ForeignKey(Chat, related_name='media', on_delete=models.CASCADE, null=True)
+    uploader = models.ForeignKey(User, related_name='uploaded_media', on_delete=models.SET_NULL, null=True)
     file = models.FileField(upload_to='message-media/')
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
@@ -52,3 +93,11 @@ class MessageMedia(models.Model):
         verbose_name = 'message media'
         verbose_name_plural = 'message medias'
         ordering = ('id',)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=TokenUser)
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=TokenUser)
+def websocket_user_cache_signal(sender, instance, **kwargs):
+    user_cache.evict_user(instance.pk)
@@ -1,3 +1,4 @@
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 from rest_framework.generics import get_object_or_404
 
@@ -14,6 +15,17 @@ class MessageMediaSerializer(serializers.ModelSerializer):
         fields = ['id', 'file']
 
 
+class MessageMediaUploadSerializer(serializers.Serializer):
+    files = serializers.ListField(child=serializers.FileField(), allow_empty=False, max_length=10)
+
+    def create(self, validated_data):
+        chat, user = self.context['chat'], self.context['request'].user
+        return [
+            MessageMedia.objects.create(chat=chat, uploader=user, file=file)
+            for file in validated_data['files']
+        ]
+
+
 class MessageSerializer(serializers.ModelSerializer):
     sender = serializers.CharField(read_only=True, source='sender.email')
     media = MessageMediaSerializer(many=True, read_only=True)
@@ -25,13 +37,22 @@ class MessageSerializer(serializers.ModelSerializer):
 
 
 class ChatSerializer(serializers.ModelSerializer):
-    messages = MessageSerializer(many=True, read_only=True)
+    messages = serializers.SerializerMethodField()
+    has_more = serializers.SerializerMethodField()
     participants = UserListSerializer(many=True, read_only=True)
     created_at = TimestampField(read_only=True)
 
     class Meta:
         model = Chat
-        fields = ['id', 'participants', 'is_group', 'created_at', 'messages']
+        fields = ['id', 'participants', 'is_group', 'created_at', 'messages', 'has_more']
+
+    @extend_schema_field(MessageSerializer(many=True))
+    def get_messages(self, obj):
+        messages = self.context.get('messages', [])
+        return MessageSerializer(messages, many=True, context=self.context).data
+
+    def get_has_more(self, obj) -> bool:
+        return self.context.get('has_more', False)
 
 
 class ChatListSerializer(serializers.ModelSerializer):
@@ -1,10 +1,27 @@
-from django.test import TestCase
+import json
+import shutil
+import tempfile
+from unittest import mock
+
+from channels.db import database_sync_to_async
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db.models import F
+from django.test import TestCase, TransactionTestCase, override_settings
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
 
-from apps.chat.models import Chat
+from apps.accounts.authentication import UserRefreshToken
+from apps.accounts.models import TokenUser, auth_version_cache_key
+from apps.chat.models import Chat, Message, MessageMedia
+from apps.chat.middleware import JwtAuthMiddleware, get_user, user_cache
+from apps.chat.routing import websocket_urlpatterns
 
 User = get_user_model()
 
@@ -54,4 +71,184 @@ class ChatTests(TestCase):
         self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + login_response.data['access'])
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data['results']), 1)
+
+
+class ChatHistoryTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='user@example.com', password='password!123')
+        self.chat = Chat.objects.create(name='Test Chat')
+        self.chat.participants.add(self.user)
+        self.messages = [
+            Message.objects.create(chat=self.chat, sender=self.user, content=f'Message {num}', type='text')
+            for num in range(7)
+        ]
+        MessageMedia.objects.create(message=self.messages[-1], file='message-media/file.txt')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('chat-detail', kwargs={'chat_id': self.chat.id})
+
+    def contents(self, response):
+        return [message['content'] for message in response.data['messages']]
+
+    def test_latest_window(self):
+        response = self.client.get(self.url, {'limit': 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.contents(response), ['Message 4', 'Message 5', 'Message 6'])
+        self.assertTrue(response.data['has_more'])
+        self.assertEqual(len(response.data['messages'][-1]['media']), 1)
+
+    def test_before_and_after_cursors(self):
+        response = self.client.get(self.url, {'limit': 3, 'before': self.messages[2].id})
+        self.assertEqual(self.contents(response), ['Message 0', 'Message 1'])
+        self.assertFalse(response.data['has_more'])
+
+        response = self.client.get(self.url, {'limit': 3, 'after': self.messages[2].id})
+        self.assertEqual(self.contents(response), ['Message 3', 'Message 4', 'Message 5'])
+        self.assertTrue(response.data['has_more'])
+
+    def test_query_count_does_not_depend_on_history(self):
+        with self.assertNumQueries(4):
+            self.client.get(self.url, {'limit': 3})
+
+
+class MessageMediaUploadTests(TestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        self.user = User.objects.create_user(email='user@example.com', password='password!123')
+        self.chat = Chat.objects.create(name='Test Chat')
+        self.chat.participants.add(self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('chat-media-upload', kwargs={'chat_id': self.chat.id})
+
+    def test_upload_returns_unattached_media(self):
+        files = [SimpleUploadedFile(f'file{num}.txt', b'content') for num in range(2)]
+        with override_settings(MEDIA_ROOT=self.media_root):
+            response = self.client.post(self.url, {'files': files}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 2)
+        media = MessageMedia.objects.get(id=response.data[0]['id'])
+        self.assertEqual((media.chat, media.uploader, media.message), (self.chat, self.user, None))
+
+    def test_upload_requires_participation(self):
+        other_chat = Chat.objects.create(name='Other Chat')
+        url = reverse('chat-media-upload', kwargs={'chat_id': other_chat.id})
+        response = self.client.post(url, {'files': [SimpleUploadedFile('file.txt', b'content')]}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ChatConsumerTests(TransactionTestCase):
+
+    def setUp(self):
+        self.sender = User.objects.create_user(email='sender@example.com', password='password!123')
+        self.receiver = User.objects.create_user(email='receiver@example.com', password='password!123')
+        self.chat = Chat.objects.create(name='Test Chat')
+        self.chat.participants.add(self.sender, self.receiver)
+
+    def communicator(self, user):
+        communicator = WebsocketCommunicator(
+            URLRouter(websocket_urlpatterns), f'/ws/chat/{self.chat.id}/', headers=[(b'host', b'testserver')]
+        )
+        communicator.scope['user'] = user
+        return communicator
+
+    async def test_message_reaches_every_participant(self):
+        sender, receiver = self.communicator(self.sender), self.communicator(self.receiver)
+        self.assertTrue((await sender.connect())[0])
+        self.assertTrue((await receiver.connect())[0])
+
+        await sender.send_json_to({'message': 'Hello', 'type': 'text'})
+        for communicator in sender, receiver:
+            response = await communicator.receive_json_from()
+            self.assertEqual(response['message']['content'], 'Hello')
+            self.assertEqual(response['message']['sender'], self.sender.email)
+
+        await sender.disconnect()
+        await receiver.disconnect()
+
+    async def test_message_is_broadcast_serialized(self):
+        channel_layer = get_channel_layer()
+        channel_name = await channel_layer.new_channel()
+        await channel_layer.group_add(f'chat_{self.chat.id}', channel_name)
+        sender = self.communicator(self.sender)
+        await sender.connect()
+
+        await sender.send_json_to({'message': 'Hello', 'type': 'text'})
+        event = await channel_layer.receive(channel_name)
+        self.assertEqual(json.loads(event['message'])['content'], 'Hello')
+
+        await sender.receive_json_from()
+        await sender.disconnect()
+
+    async def test_message_attaches_uploaded_media(self):
+        media = await MessageMedia.objects.acreate(chat=self.chat, uploader=self.sender, file='message-media/file.txt')
+        foreign_media = await MessageMedia.objects.acreate(
+            chat=self.chat, uploader=self.receiver, file='message-media/file.txt'
+        )
+        sender = self.communicator(self.sender)
+        await sender.connect()
+
+        await sender.send_json_to({'message': 'Hello', 'type': 'file', 'media_ids': [media.id, foreign_media.id]})
+        response = await sender.receive_json_from()
+        self.assertEqual([item['id'] for item in response['message']['media']], [media.id])
+        await sender.disconnect()
+
+
+class JwtAuthMiddlewareTests(TransactionTestCase):
+
+    def setUp(self):
+        user_cache.clear()
+        self.user = User.objects.create_user(email='user@example.com', password='password!123')
+        self.token = str(AccessToken.for_user(self.user))
+        self.chat = Chat.objects.create(name='Test Chat')
+        self.chat.participants.add(self.user)
+        self.path = f'/ws/chat/{self.chat.id}/'
+
+    def communicator(self, path, headers=(), subprotocols=None):
+        application = JwtAuthMiddleware(URLRouter(websocket_urlpatterns))
+        headers = [(b'host', b'testserver'), *headers]
+        return WebsocketCommunicator(application, path, headers=headers, subprotocols=subprotocols)
+
+    async def assertConnects(self, communicator, subprotocol=None):
+        connected, accepted_subprotocol = await communicator.connect()
+        self.assertTrue(connected)
+        self.assertEqual(accepted_subprotocol, subprotocol)
+        await communicator.disconnect()
+
+    async def test_token_sources(self):
+        await self.assertConnects(self.communicator(self.path, [(b'authorization', f'Bearer {self.token}'.encode())]))
+        await self.assertConnects(self.communicator(f'{self.path}?token={self.token}'))
+        await self.assertConnects(self.communicator(self.path, subprotocols=['bearer', self.token]), 'bearer')
+
+    async def test_rejects_invalid_token(self):
+        connected, _ = await self.communicator(f'{self.path}?token=invalid').connect()
+        self.assertFalse(connected)
+
+    async def test_user_is_cached_until_changed(self):
+        self.assertEqual((await get_user(self.token)).pk, self.user.pk)
+        with mock.patch('apps.chat.middleware.get_user_by_id') as get_user_by_id:
+            self.assertEqual((await get_user(self.token)).pk, self.user.pk)
+        get_user_by_id.assert_not_called()
+
+        await self.user.adelete()
+        self.assertFalse((await get_user(self.token)).is_authenticated)
+
+    async def test_proxy_user_changes_evict(self):
+        await get_user(self.token)
+        user = TokenUser.from_claims(self.user.pk, self.user.email)
+        user.first_name = 'Changed'
+        await user.asave(update_fields=['first_name'])
+        self.assertEqual((await get_user(self.token)).first_name, 'Changed')
+
+    async def test_revoked_token_is_rejected_when_cached(self):
+        refresh = await database_sync_to_async(UserRefreshToken.for_user)(self.user)
+        token = str(refresh.access_token)
+        self.assertEqual((await get_user(token)).pk, self.user.pk)
+        # A password change on another worker: the shared auth version moves, this process' cache does not.
+        await User.objects.filter(pk=self.user.pk).aupdate(password_version=F('password_version') + 1)
+        await cache.adelete(auth_version_cache_key(self.user.pk))
+        self.assertFalse((await get_user(token)).is_authenticated)
@@ -1,8 +1,9 @@
 from django.urls import path
 
-from apps.chat.views import ChatView, ChatDetailView
+from apps.chat.views import ChatView, ChatDetailView, MessageMediaUploadView
 
 urlpatterns = [
     path('chats/', ChatView.as_view(), name='chat-list'),
     path('chats/<str:chat_id>/', ChatDetailView.as_view(), name='chat-detail'),
+    path('chats/<str:chat_id>/media/', MessageMediaUploadView.as_view(), name='chat-media-upload'),
 ]
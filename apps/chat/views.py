@@ -1,27 +1,47 @@
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
 from rest_framework.generics import get_object_or_404
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, OpenApiParameter
 
-from apps.chat.models import Chat
-from apps.chat.serializers import ChatSerializer, ChatListSerializer
+from apps.chat.models import Chat, Message
+from apps.chat.serializers import (
+    ChatSerializer, ChatListSerializer, MessageMediaSerializer, MessageMediaUploadSerializer
+)
+from config.pagination import CursorPaginationMixin, paginated
 
 
-class ChatView(APIView):
+MESSAGE_WINDOW_SIZE = 50
+MAX_MESSAGE_WINDOW_SIZE = 200
+
+CHAT_HISTORY_PARAMETERS = [
+    OpenApiParameter('before', type=OpenApiTypes.STR, location=OpenApiParameter.QUERY,
+                     description="Load messages sent before this message id"),
+    OpenApiParameter('after', type=OpenApiTypes.STR, location=OpenApiParameter.QUERY,
+                     description="Load messages sent after this message id"),
+    OpenApiParameter('limit', type=OpenApiTypes.INT, location=OpenApiParameter.QUERY,
+                     description="Number of messages, {} by default".format(MESSAGE_WINDOW_SIZE)),
+]
+
+
+class ChatView(CursorPaginationMixin, APIView):
     serializer_class = ChatListSerializer
     permission_classes = (IsAuthenticated,)
+    ordering = '-created_at', '-id'
 
     @extend_schema(
-        responses={200: ChatListSerializer(many=True)},
+        responses={200: paginated(ChatListSerializer)},
         tags=['Chat'],
         description='Get all chats'
     )
     def get(self, request):
         chats = Chat.objects.filter(participants=request.user).prefetch_related('participants')
-        serializer = self.serializer_class(chats, many=True, context={'request': request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        page = self.paginate_queryset(chats)
+        serializer = self.serializer_class(page, many=True, context={'request': request})
+        return self.get_paginated_response(serializer.data)
 
     @extend_schema(
         responses={201: ChatSerializer},
@@ -41,13 +61,48 @@ class ChatDetailView(APIView):
 
     @extend_schema(
         responses={200: ChatSerializer},
+        parameters=CHAT_HISTORY_PARAMETERS,
         tags=['Chat'],
-        description='Get chat by id'
+        description='Get chat by id with the latest messages, or the messages before or after a message'
     )
     def get(self, request, chat_id):
-        chat = get_object_or_404(
-            Chat.objects.prefetch_related('messages', 'participants'),
-            id=chat_id, participants=request.user
+        chat = get_object_or_404(Chat.objects.prefetch_related('participants'), id=chat_id, participants=request.user)
+        chat_messages = Message.objects.filter(chat=chat)
+        before = request.query_params.get('before')
+        after = request.query_params.get('after')
+        messages, has_more = chat_messages.select_related('sender').prefetch_related('media').window(
+            before=get_object_or_404(chat_messages, id=before) if before else None,
+            after=get_object_or_404(chat_messages, id=after) if after else None,
+            size=self.get_window_size(request)
         )
-        serializer = self.serializer_class(chat, context={'request': request})
+        context = {'request': request, 'messages': messages, 'has_more': has_more}
+        serializer = self.serializer_class(chat, context=context)
         return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @staticmethod
+    def get_window_size(request):
+        try:
+            size = int(request.query_params['limit'])
+        except (KeyError, ValueError):
+            return MESSAGE_WINDOW_SIZE
+        return min(max(size, 1), MAX_MESSAGE_WINDOW_SIZE)
+
+
+class MessageMediaUploadView(APIView):
+    serializer_class = MessageMediaUploadSerializer
+    permission_classes = (IsAuthenticated,)
+    parser_classes = (MultiPartParser,)
+
+    @extend_schema(
+        request=MessageMediaUploadSerializer,
+        responses={201: MessageMediaSerializer(many=True)},
+        tags=['Chat'],
+        description='Upload message attachments, then send their ids as media_ids over the chat socket'
+    )
+    def post(self, request, chat_id):
+        chat = get_object_or_404(Chat, id=chat_id, participants=request.user)
+        serializer = self.serializer_class(data=request.data, context={'request': request, 'chat': chat})
+        serializer.is_valid(raise_exception=True)
+        media = serializer.save()
+        return Response(MessageMediaSerializer(media, many=True, context={'request': request}).data,
+                        status=status.HTTP_201_CREATED)
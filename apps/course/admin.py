@@ -23,6 +23,9 @@ class CourseAdmin(admin.ModelAdmin):
     readonly_fields = ('average_rating', 'duration', 'created_at', 'lesson_count', 'color1_bar', 'color2_bar')
     search_fields = ('title',)
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_catalog_stats()
+
     def color1_bar(self, course):
         hex_code = course.color1.hex_code
         return mark_safe(f'<div style="background: {hex_code}; padding: 10px; border: 1px solid black"></div>')
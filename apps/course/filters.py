@@ -1,6 +1,6 @@
 import django_filters.rest_framework as filters
-from django.db.models import Count, Avg, F, Case, When
-from django.db.models.functions import Round
+from django.db.models import F
+from django.db.models.functions import Coalesce, Round
 
 from apps.course.models import Course
 
@@ -35,25 +35,16 @@ class CourseFilter(filters.FilterSet):
 
     def filter_popular(self, queryset, _, value):
         if value is True:
-            return queryset.annotate(count=Count('enrollments')).order_by('-count')[:POPULAR_COURSES_COUNT]
+            return queryset.order_by(F('stats__student_count').desc(nulls_last=True))[:POPULAR_COURSES_COUNT]
         return queryset
 
     def filter_rating(self, queryset, _, value):
-        queryset = queryset.annotate(avg_rating=Round(Avg('reviews__rating')))
+        queryset = queryset.with_catalog_stats().annotate(avg_rating=Round('_average_rating'))
         return queryset.filter(avg_rating=value)
 
     def filter_price(self, queryset, _, value):
         queryset = queryset.annotate(
-            _lesson_count=Count('sections__lessons')
-        ).annotate(
-            _price=F('_lesson_count') * F('lesson_price')
-        ).annotate(
-            _discounted_price=F('_lesson_count') * F('discounted_lesson_price')
-        ).annotate(
-            conditional_price=Case(
-                When(_discounted_price__isnull=False, then=F('_discounted_price')),
-                When(_discounted_price__isnull=True, then=F('_price'))
-            )
+            conditional_price=Coalesce('stats__discounted_price', 'stats__price')
         )
 
         if value.start:
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.course.models import Course, CourseStats
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the denormalized course statistics from lessons, enrollments and reviews'
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_ids', nargs='*', help='Only rebuild the given courses')
+
+    def handle(self, *args, **options):
+        courses = Course.objects.all()
+        if options['course_ids']:
+            courses = courses.filter(id__in=options['course_ids'])
+
+        with transaction.atomic():
+            stats = CourseStats.objects.rebuild(courses)
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt statistics of {len(stats)} course(s)'))
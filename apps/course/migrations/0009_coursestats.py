@@ -0,0 +1,75 @@
+# Generated by Django 5.0.4 on 2026-10-18 13:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def fill_course_stats(apps, schema_editor):
+    Course = apps.get_model('course', 'Course')
+    CourseStats = apps.get_model('course', 'CourseStats')
+    Enrollment = apps.get_model('course', 'Enrollment')
+    Lesson = apps.get_model('course', 'Lesson')
+    Review = apps.get_model('review', 'Review')
+
+    lessons = {
+        row['section__course_id']: row
+        for row in Lesson.objects.order_by().values('section__course_id').annotate(
+            count=Count('id'), duration=Sum('duration')
+        )
+    }
+    students = dict(
+        Enrollment.objects.order_by().values('course_id').annotate(count=Count('id')).values_list('course_id', 'count')
+    )
+    reviews = {
+        row['course_id']: row
+        for row in Review.objects.order_by().values('course_id').annotate(count=Count('id'), rating_sum=Sum('rating'))
+    }
+
+    stats = []
+    for course in Course.objects.order_by().values('id', 'lesson_price', 'discounted_lesson_price'):
+        course_lessons = lessons.get(course['id'], {'count': 0, 'duration': 0})
+        course_reviews = reviews.get(course['id'], {'count': 0, 'rating_sum': 0})
+        lesson_count = course_lessons['count']
+        stats.append(CourseStats(
+            course_id=course['id'],
+            lesson_count=lesson_count,
+            duration=course_lessons['duration'] or 0,
+            student_count=students.get(course['id'], 0),
+            review_count=course_reviews['count'],
+            rating_sum=course_reviews['rating_sum'] or 0,
+            price=course['lesson_price'] * lesson_count if course['lesson_price'] is not None else None,
+            discounted_price=(course['discounted_lesson_price'] * lesson_count
+                              if course['discounted_lesson_price'] is not None else None),
+        ))
+    CourseStats.objects.bulk_create(stats, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0008_lesson_is_open'),
+        ('review', '0003_alter_review_comment'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseStats',
+            fields=[
+                ('course', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='course.course', verbose_name='course')),
+                ('lesson_count', models.PositiveIntegerField(default=0, verbose_name='lesson count')),
+                ('duration', models.PositiveIntegerField(default=0, verbose_name='duration')),
+                ('student_count', models.PositiveIntegerField(db_index=True, default=0, verbose_name='student count')),
+                ('review_count', models.PositiveIntegerField(default=0, verbose_name='review count')),
+                ('rating_sum', models.PositiveIntegerField(default=0, verbose_name='rating sum')),
+                ('price', models.PositiveIntegerField(null=True, verbose_name='price')),
+                ('discounted_price', models.PositiveIntegerField(null=True, verbose_name='discounted price')),
+            ],
+            options={
+                'verbose_name': 'course stats',
+                'verbose_name_plural': 'course stats',
+                'db_table': 'course_stats',
+            },
+        ),
+        migrations.RunPython(fill_course_stats, migrations.RunPython.noop),
+    ]
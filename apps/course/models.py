@@ -1,13 +1,16 @@
 import decimal
 import uuid
 
+from django.apps import apps
 from django.db import models
-from django.db.models import Avg, Sum
-from django.db.models.signals import post_save, post_delete
+from django.db.models import Avg, Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Cast, Coalesce, NullIf
+from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
 
 from apps.accounts.models import User
-from apps.course.utils import parting_course, reordering_sections, reordering_lessons
+from apps.course.utils import bulk_course_edit, schedule_course_maintenance
+from config.cache import invalidate_tags
 
 
 class Category(models.Model):
@@ -40,6 +43,63 @@ class Color(models.Model):
         return self.name
 
 
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def category_cache_signal(sender, instance, **kwargs):
+    invalidate_tags('categories')
+
+
+@receiver(post_save, sender=Color)
+@receiver(post_delete, sender=Color)
+def color_cache_signal(sender, instance, **kwargs):
+    invalidate_tags('colors')
+
+
+class CourseQuerySet(models.QuerySet):
+
+    def with_catalog_stats(self):
+        """
+        Annotate every course with the values stored in its ``CourseStats`` row,
+        so the ``Course`` properties below do not run a query per row.
+        """
+        if '_lesson_count' in self.query.annotations:
+            return self
+
+        return self.annotate(
+            _lesson_count=Coalesce('stats__lesson_count', 0),
+            _duration=Coalesce('stats__duration', 0),
+            _student_count=Coalesce('stats__student_count', 0),
+            _review_count=Coalesce('stats__review_count', 0),
+            _average_rating=Cast('stats__rating_sum', models.FloatField()) / NullIf('stats__review_count', 0),
+        )
+
+    def with_live_stats(self):
+        """
+        Annotate every course with the same values as ``with_catalog_stats``,
+        aggregated from the lessons, enrollments and reviews themselves.
+        """
+        review_model = apps.get_model('review', 'Review')
+        lessons = Lesson.objects.filter(section__course=OuterRef('pk')).order_by().values('section__course')
+        enrollments = Enrollment.objects.filter(course=OuterRef('pk')).order_by().values('course')
+        reviews = review_model.objects.filter(course=OuterRef('pk')).order_by().values('course')
+
+        return self.annotate(
+            _lesson_count=self._subquery_value(lessons, Count('id')),
+            _duration=self._subquery_value(lessons, Sum('duration')),
+            _student_count=self._subquery_value(enrollments, Count('id')),
+            _review_count=self._subquery_value(reviews, Count('id')),
+            _rating_sum=self._subquery_value(reviews, Sum('rating')),
+            _average_rating=Subquery(reviews.annotate(value=Avg('rating')).values('value')),
+        )
+
+    @staticmethod
+    def _subquery_value(queryset, aggregate):
+        return Coalesce(
+            Subquery(queryset.annotate(value=aggregate).values('value')), 0,
+            output_field=models.IntegerField()
+        )
+
+
 class Course(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     teacher = models.ForeignKey(User, on_delete=models.CASCADE,
@@ -57,7 +117,9 @@ class Course(models.Model):
     part_lesson_count = models.PositiveIntegerField(verbose_name="part lesson count", default=10)
     lesson_price = models.PositiveIntegerField(verbose_name="lesson price", null=True)
     discounted_lesson_price = models.PositiveIntegerField(verbose_name="discounted lesson price", null=True)
-    created_at = models.DateTimeField(auto_now_add=True, verbose_name="created at")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="created at", db_index=True)
+
+    objects = CourseQuerySet.as_manager()
 
     class Meta:
         db_table = 'course'
@@ -67,23 +129,34 @@ class Course(models.Model):
 
     @property
     def lesson_count(self) -> int:
+        if hasattr(self, '_lesson_count'):
+            return self._lesson_count
         return Lesson.objects.filter(section__course=self).count()
     
     @property
     def student_count(self) -> int:
+        if hasattr(self, '_student_count'):
+            return self._student_count
         return self.enrollments.count()
     
     @property
     def review_count(self) -> int:
+        if hasattr(self, '_review_count'):
+            return self._review_count
         return self.reviews.count()
 
     @property
     def average_rating(self) -> decimal.Decimal:
-        rating = self.reviews.aggregate(Avg('rating'))['rating__avg']
+        if hasattr(self, '_average_rating'):
+            rating = self._average_rating
+        else:
+            rating = self.reviews.aggregate(Avg('rating'))['rating__avg']
         return decimal.Decimal(round(rating, 1)) if rating else None
     
     @property
     def duration(self) -> int:
+        if hasattr(self, '_duration'):
+            return self._duration
         course_duration = Lesson.objects.filter(section__course=self).aggregate(
             total_duration=Sum('duration')
         )['total_duration']
@@ -103,9 +176,119 @@ class Course(models.Model):
         return self.title
 
     def save(self, *args, **kwargs):
-        lessons = Lesson.objects.filter(section__course=self)
-        parting_course(self, lessons)
-        return super().save(*args, **kwargs)
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if not adding:
+            schedule_course_maintenance(self.pk, 'parts')
+
+    def delete(self, *args, **kwargs):
+        with bulk_course_edit():
+            return super().delete(*args, **kwargs)
+
+
+class CourseStatsQuerySet(models.QuerySet):
+
+    def increment(self, course_id, **deltas):
+        """Shift the counters of a course by the given deltas in a single UPDATE."""
+        values = {field: F(field) + delta for field, delta in deltas.items()}
+        if 'lesson_count' in values:
+            values.update(self._prices(values['lesson_count']))
+        return self.filter(course_id=course_id).update(**values)
+
+    def refresh_prices(self, course_id):
+        return self.filter(course_id=course_id).update(**self._prices(F('lesson_count')))
+
+    def refresh_lessons(self, course_id):
+        lessons = Lesson.objects.filter(section__course_id=course_id).aggregate(
+            lesson_count=Count('id'), duration=Sum('duration')
+        )
+        lesson_count = lessons['lesson_count']
+        return self.filter(course_id=course_id).update(
+            lesson_count=lesson_count, duration=lessons['duration'] or 0, **self._prices(lesson_count)
+        )
+
+    def refresh_reviews(self, course_id):
+        review_model = apps.get_model('review', 'Review')
+        reviews = review_model.objects.filter(course_id=course_id).aggregate(
+            review_count=Count('id'), rating_sum=Sum('rating')
+        )
+        return self.filter(course_id=course_id).update(
+            review_count=reviews['review_count'], rating_sum=reviews['rating_sum'] or 0
+        )
+
+    def rebuild(self, courses=None):
+        """Recompute the stats rows of ``courses`` (all courses by default) from scratch."""
+        courses = (Course.objects.all() if courses is None else courses).with_live_stats()
+        stats = [
+            CourseStats(
+                course=course,
+                lesson_count=course._lesson_count,
+                duration=course._duration,
+                student_count=course._student_count,
+                review_count=course._review_count,
+                rating_sum=course._rating_sum,
+                price=course.lesson_price * course._lesson_count if course.lesson_price is not None else None,
+                discounted_price=(course.discounted_lesson_price * course._lesson_count
+                                  if course.discounted_lesson_price is not None else None),
+            )
+            for course in courses.order_by()
+        ]
+        return self.bulk_create(
+            stats, update_conflicts=True, unique_fields=['course'],
+            update_fields=[
+                'lesson_count', 'duration', 'student_count', 'review_count', 'rating_sum', 'price', 'discounted_price'
+            ]
+        )
+
+    @staticmethod
+    def _prices(lesson_count):
+        course = Course.objects.filter(pk=OuterRef('course_id'))
+        return {
+            'price': lesson_count * Subquery(course.values('lesson_price')),
+            'discounted_price': lesson_count * Subquery(course.values('discounted_lesson_price')),
+        }
+
+
+class CourseStats(models.Model):
+    course = models.OneToOneField(Course, on_delete=models.CASCADE, primary_key=True,
+                                  related_name='stats', verbose_name='course')
+    lesson_count = models.PositiveIntegerField(default=0, verbose_name='lesson count')
+    duration = models.PositiveIntegerField(default=0, verbose_name='duration')
+    student_count = models.PositiveIntegerField(default=0, verbose_name='student count', db_index=True)
+    review_count = models.PositiveIntegerField(default=0, verbose_name='review count')
+    rating_sum = models.PositiveIntegerField(default=0, verbose_name='rating sum')
+    price = models.PositiveIntegerField(null=True, verbose_name='price')
+    discounted_price = models.PositiveIntegerField(null=True, verbose_name='discounted price')
+
+    objects = CourseStatsQuerySet.as_manager()
+
+    class Meta:
+        db_table = 'course_stats'
+        verbose_name = 'course stats'
+        verbose_name_plural = 'course stats'
+
+    def __str__(self):
+        return str(self.course)
+
+    @property
+    def average_rating(self) -> decimal.Decimal:
+        if not self.review_count:
+            return None
+        return decimal.Decimal(round(self.rating_sum / self.review_count, 1))
+
+
+@receiver(post_save, sender=Course)
+def course_stats_signal(sender, instance, created, **kwargs):
+    if created:
+        CourseStats.objects.rebuild(Course.objects.filter(pk=instance.pk))
+    else:
+        CourseStats.objects.refresh_prices(instance.pk)
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def course_cache_signal(sender, instance, **kwargs):
+    invalidate_tags('courses', f'course:{instance.pk}', 'teachers')
 
 
 class Section(models.Model):
@@ -123,6 +306,8 @@ class Section(models.Model):
 
     @property
     def lesson_count(self) -> int:
+        if hasattr(self, '_lesson_count'):
+            return self._lesson_count
         return self.lessons.count()
 
     @property
@@ -148,12 +333,16 @@ class Section(models.Model):
             self.order = course_sections.count() + 1
         return super().save(*args, **kwargs)
 
+    def delete(self, *args, **kwargs):
+        with bulk_course_edit():
+            return super().delete(*args, **kwargs)
+
 
 @receiver(post_save, sender=Section)
 @receiver(post_delete, sender=Section)
 def section_signal(sender, instance, **kwargs):
-    course_sections = instance.course.sections.all().order_by('order')
-    reordering_sections(course_sections)
+    schedule_course_maintenance(instance.course_id, 'sections')
+    invalidate_tags(f'course:{instance.course_id}')
 
 
 class Lesson(models.Model):
@@ -180,15 +369,45 @@ class Lesson(models.Model):
         if not self.order:
             self.order = course_lessons.count() + 1
         super().save(*args, **kwargs)
-        lessons = Lesson.objects.filter(section__course=self.section.course)
-        parting_course(self.section.course, lessons)
     
 
+def lesson_course_ids(lesson):
+    """The course of a lesson, and the one it was just moved from, if any."""
+    course_ids = {lesson.section.course_id, getattr(lesson, '_previous_course_id', None)}
+    course_ids.discard(None)
+    return course_ids
+
+
+@receiver(pre_save, sender=Lesson)
+def lesson_previous_course_signal(sender, instance, update_fields=None, **kwargs):
+    instance._previous_course_id = None
+    if not instance._state.adding and (update_fields is None or 'section' in update_fields):
+        instance._previous_course_id = Lesson.objects.filter(pk=instance.pk).values_list(
+            'section__course_id', flat=True
+        ).first()
+
+
 @receiver(post_save, sender=Lesson)
 @receiver(post_delete, sender=Lesson)
 def lesson_signal(sender, instance, **kwargs):
-    course_lessons = Lesson.objects.filter(section__course=instance.section.course).order_by('section__order', 'order')
-    reordering_lessons(course_lessons)
+    for course_id in lesson_course_ids(instance):
+        schedule_course_maintenance(course_id, 'lessons')
+        schedule_course_maintenance(course_id, 'parts')
+        invalidate_tags('courses', f'course:{course_id}')
+
+
+@receiver(post_save, sender=Lesson)
+def lesson_stats_save_signal(sender, instance, created, **kwargs):
+    if created:
+        CourseStats.objects.increment(instance.section.course_id, lesson_count=1, duration=instance.duration)
+    else:
+        for course_id in lesson_course_ids(instance):
+            CourseStats.objects.refresh_lessons(course_id)
+
+
+@receiver(post_delete, sender=Lesson)
+def lesson_stats_delete_signal(sender, instance, **kwargs):
+    CourseStats.objects.increment(instance.section.course_id, lesson_count=-1, duration=-instance.duration)
 
 
 class Video(models.Model):
@@ -210,6 +429,12 @@ class Video(models.Model):
 
     def __str__(self):
         return self.lesson.title
+
+
+@receiver(post_save, sender=Video)
+@receiver(post_delete, sender=Video)
+def video_cache_signal(sender, instance, **kwargs):
+    invalidate_tags('videos')
     
 
 class CompletedLesson(models.Model):
@@ -227,6 +452,12 @@ class CompletedLesson(models.Model):
         unique_together = ('user', 'lesson')
 
 
+@receiver(post_save, sender=CompletedLesson)
+@receiver(post_delete, sender=CompletedLesson)
+def completed_lesson_cache_signal(sender, instance, **kwargs):
+    invalidate_tags(f'progress:{instance.user_id}')
+
+
 class Enrollment(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE,
@@ -244,6 +475,24 @@ class Enrollment(models.Model):
         unique_together = ('course', 'user')
 
 
+@receiver(post_save, sender=Enrollment)
+def enrollment_stats_save_signal(sender, instance, created, **kwargs):
+    if created:
+        CourseStats.objects.increment(instance.course_id, student_count=1)
+
+
+@receiver(post_delete, sender=Enrollment)
+def enrollment_stats_delete_signal(sender, instance, **kwargs):
+    CourseStats.objects.increment(instance.course_id, student_count=-1)
+
+
+@receiver(post_save, sender=Enrollment)
+@receiver(post_delete, sender=Enrollment)
+def enrollment_cache_signal(sender, instance, **kwargs):
+    # The student counts of the catalog list catch up when its entries expire.
+    invalidate_tags(f'course:{instance.course_id}', f'progress:{instance.user_id}')
+
+
 class PartEnrollment(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE,
@@ -261,6 +510,12 @@ class PartEnrollment(models.Model):
         unique_together = ('part', 'user')
 
 
+@receiver(post_save, sender=PartEnrollment)
+@receiver(post_delete, sender=PartEnrollment)
+def part_enrollment_cache_signal(sender, instance, **kwargs):
+    invalidate_tags(f'progress:{instance.user_id}')
+
+
 class CoursePart(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='parts', db_index=True)
@@ -275,6 +530,12 @@ class CoursePart(models.Model):
     def __str__(self):
         return f'Part {self.order}'
 
+    @property
+    def lesson_count(self) -> int:
+        if hasattr(self, '_lesson_count'):
+            return self._lesson_count
+        return self.lessons.count()
+
     def save(self, *args, **kwargs):
         course_parts = self.course.parts.all()
         if not self.order:
@@ -0,0 +1,100 @@
+from collections import Counter
+from functools import cached_property
+
+from apps.course.models import CompletedLesson, Enrollment, PartEnrollment
+
+
+class UserProgress:
+    """
+    Enrollments and completed lessons of one user, loaded once per request so
+    that serializers can answer progress questions in memory.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self.is_authenticated = bool(user and user.is_authenticated)
+
+    @cached_property
+    def enrolled_course_ids(self) -> set:
+        if not self.is_authenticated:
+            return set()
+        return set(Enrollment.objects.filter(user=self.user).values_list('course_id', flat=True))
+
+    @cached_property
+    def enrolled_part_ids(self) -> set:
+        if not self.is_authenticated:
+            return set()
+        return set(PartEnrollment.objects.filter(user=self.user).values_list('part_id', flat=True))
+
+    @cached_property
+    def _completed_lessons(self) -> list:
+        if not self.is_authenticated:
+            return []
+        return list(CompletedLesson.objects.filter(user=self.user).values_list(
+            'lesson_id', 'lesson__section_id', 'lesson__section__course_id', 'lesson__order'
+        ))
+
+    @cached_property
+    def completed_lesson_ids(self) -> set:
+        return {lesson_id for lesson_id, _, _, _ in self._completed_lessons}
+
+    @cached_property
+    def completed_positions(self) -> set:
+        return {(section_id, order) for _, section_id, _, order in self._completed_lessons}
+
+    @cached_property
+    def completed_by_course(self) -> Counter:
+        return Counter(course_id for _, _, course_id, _ in self._completed_lessons)
+
+    @cached_property
+    def completed_by_section(self) -> Counter:
+        return Counter(section_id for _, section_id, _, _ in self._completed_lessons)
+
+    @cached_property
+    def last_completed_orders(self) -> dict:
+        orders = {}
+        for _, _, course_id, order in self._completed_lessons:
+            orders[course_id] = max(order, orders.get(course_id, order))
+        return orders
+
+    def is_enrolled(self, course_id) -> bool:
+        return course_id in self.enrolled_course_ids
+
+    def is_part_enrolled(self, part_id) -> bool:
+        return part_id in self.enrolled_part_ids
+
+    def is_completed(self, lesson_id) -> bool:
+        return lesson_id in self.completed_lesson_ids
+
+    def is_lesson_available(self, lesson) -> bool:
+        if lesson.is_open:
+            return True
+        if not self.is_enrolled(lesson.section.course_id):
+            return False
+        if lesson.order == 1:
+            return True
+        return (lesson.section_id, lesson.order - 1) in self.completed_positions
+
+    def last_completed_order(self, course_id):
+        """Order of the furthest lesson completed in the course, ``None`` before the first one."""
+        return self.last_completed_orders.get(course_id)
+
+    def course_percentage(self, course_id, lesson_count) -> int:
+        return self._percentage(self.completed_by_course[course_id], lesson_count)
+
+    def section_percentage(self, section_id, lesson_count) -> int:
+        return self._percentage(self.completed_by_section[section_id], lesson_count)
+
+    @staticmethod
+    def _percentage(completed_count, lesson_count) -> int:
+        return completed_count * 100 // lesson_count if lesson_count > 0 else 0
+
+
+def get_user_progress(context) -> UserProgress:
+    """Return the progress of the request user, shared by all serializers of the request."""
+    request = context.get('request')
+    progress = getattr(request, 'user_progress', None)
+    if progress is None or progress.user is not request.user:
+        progress = UserProgress(request.user)
+        request.user_progress = progress
+    return progress
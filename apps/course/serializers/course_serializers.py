@@ -1,3 +1,5 @@
+import uuid
+
 from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 from rest_framework.generics import get_object_or_404
@@ -5,7 +7,8 @@ from rest_framework.generics import get_object_or_404
 from config.utils import TimestampField
 from .color_serializers import ColorSerializer
 from .part_serializers import CoursePartListSerializer
-from ..models import Color, CompletedLesson, Course, Category, Lesson, CoursePart
+from ..models import Color, Course, Category, Lesson
+from ..progress import get_user_progress
 from apps.accounts.models import User
 from apps.accounts.serializers import TeacherSerializer
 
@@ -30,17 +33,21 @@ class CourseListSerializer(serializers.ModelSerializer):
         ]
 
     def get_enrolled(self, course) -> bool:
-        user = self.context.get('request').user
-        return user.is_authenticated and user.enrollments.filter(course=course).exists()
+        return get_user_progress(self.context).is_enrolled(course.id)
 
     @extend_schema_field(serializers.IntegerField(min_value=0, max_value=100))
     def get_completed_percentage(self, course):
-        user = self.context.get('request').user
-        if not user.is_authenticated:
+        progress = get_user_progress(self.context)
+        if not progress.is_authenticated:
             return 0
-        lesson_count = course.lesson_count
-        completed_lesson_count = CompletedLesson.objects.filter(user=user, lesson__section__course=course).count()
-        return completed_lesson_count * 100 // lesson_count if lesson_count > 0 else 0
+        return progress.course_percentage(course.id, course.lesson_count)
+
+    @classmethod
+    def add_user_fields(cls, data, progress):
+        """Set the fields that depend on the user in the rendered ``data`` of an anonymous request."""
+        course_id = uuid.UUID(data['id'])
+        data['enrolled'] = progress.is_enrolled(course_id)
+        data['completed_percentage'] = progress.course_percentage(course_id, data['lesson_count'])
 
 
 class CourseSerializer(CourseListSerializer):
@@ -84,25 +91,32 @@ class CourseSerializer(CourseListSerializer):
 
     @extend_schema_field(CoursePartListSerializer(many=True))
     def get_parts(self, course):
-        parts = CoursePart.objects.filter(course=course).select_related('course').prefetch_related('lessons')
-        print(parts.query)
-        return CoursePartListSerializer(parts, many=True, context=self.context).data
+        return CoursePartListSerializer(course.parts.all(), many=True, context=self.context).data
 
     @extend_schema_field(serializers.UUIDField())
     def get_last_available_lesson_id(self, course):
-        user = self.context.get('request').user
-        if not user.is_authenticated:
+        return self.find_last_available_lesson_id(course.id, get_user_progress(self.context))
+
+    @classmethod
+    def add_user_fields(cls, data, progress):
+        super().add_user_fields(data, progress)
+        data['last_available_lesson_id'] = cls.find_last_available_lesson_id(uuid.UUID(data['id']), progress)
+        for part in data['parts']:
+            part['is_available'] = progress.is_part_enrolled(uuid.UUID(part['id']))
+
+    @staticmethod
+    def find_last_available_lesson_id(course_id, progress):
+        if not progress.is_authenticated:
             return None
 
-        last_completed_lesson = user.completed_lessons.filter(lesson__section__course=course).last()
-        if last_completed_lesson:
-            last_available_lesson = Lesson.objects.filter(section__course=course,
-                                                          order__gt=last_completed_lesson.order).first()
-        else:
-            last_available_lesson = Lesson.objects.filter(section__course=course).first()
+        lessons = Lesson.objects.filter(section__course_id=course_id)
+        last_completed_order = progress.last_completed_order(course_id)
+        if last_completed_order is not None:
+            lessons = lessons.filter(order__gt=last_completed_order)
+        last_available_lesson = lessons.order_by('order').values('id', 'part_id').first()
 
-        if last_available_lesson and user.part_enrollments.filter(part=last_available_lesson.part).exists():
-            return last_available_lesson.id
+        if last_available_lesson and progress.is_part_enrolled(last_available_lesson['part_id']):
+            return last_available_lesson['id']
 
         return None
 
@@ -1,7 +1,8 @@
 from rest_framework import serializers
 from rest_framework.generics import get_object_or_404
 
-from apps.course.models import Video, Lesson, CompletedLesson, Section
+from apps.course.models import Video, Lesson, Section
+from apps.course.progress import get_user_progress
 from apps.quiz.serializers.group_serializrs import QuizGroupSerializer
 
 
@@ -40,24 +41,10 @@ class LessonSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'order']
 
     def get_completed(self, lesson) -> bool:
-        user = self.context.get('request').user
-        if user.is_anonymous:
-            return False
-        return CompletedLesson.objects.filter(user=user, lesson=lesson).exists()
+        return get_user_progress(self.context).is_completed(lesson.id)
 
     def get_is_available(self, lesson) -> bool:
-        if lesson.is_open:
-            return True
-        user = self.context.get('request').user
-        if user.is_anonymous or not user.enrollments.filter(course=lesson.section.course).exists():
-            return False
-        if lesson.order == 1:
-            return True
-        return CompletedLesson.objects.filter(
-            user=user,
-            lesson__section=lesson.section,
-            lesson__order=lesson.order - 1
-        ).exists()
+        return get_user_progress(self.context).is_lesson_available(lesson)
 
     @staticmethod
     def validate_section_id(value):
@@ -1,42 +1,29 @@
-from django.db.models import Sum
+from django.db.models import Count
 from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
-from apps.course.models import Section, CompletedLesson, CoursePart, Lesson
+from apps.course.models import Section, CoursePart, Lesson
+from apps.course.progress import get_user_progress
 from apps.course.serializers.lesson_serializers import LessonListSerializer
 
 
 class CoursePartSectionsSerializer(serializers.ModelSerializer):
-    lessons = serializers.SerializerMethodField(read_only=True)
-    lesson_count = serializers.SerializerMethodField(read_only=True)
-    duration = serializers.SerializerMethodField(read_only=True)
+    """A section limited to the lessons of one part, grouped by ``CoursePartSerializer.get_sections``."""
+    lessons = LessonListSerializer(source='part_lessons', many=True, read_only=True)
+    lesson_count = serializers.IntegerField(source='part_lesson_count', read_only=True)
+    duration = serializers.IntegerField(source='part_duration', read_only=True)
     completed_percentage = serializers.SerializerMethodField(read_only=True)
 
     class Meta:
         model = Section
         fields = ('id', 'title', 'completed_percentage', 'duration', 'order', 'lesson_count', 'lessons')
 
-    @extend_schema_field(LessonListSerializer(many=True))
-    def get_lessons(self, section):
-        lessons = self.context.get('lessons')
-        return LessonListSerializer(lessons.filter(section=section), many=True, context=self.context).data
-
-    def get_lesson_count(self, section) -> int:
-        lessons = self.context.get('lessons')
-        return lessons.filter(section=section).count()
-
-    def get_duration(self, section) -> int:
-        lessons = self.context.get('lessons')
-        return lessons.filter(section=section).aggregate(duration=Sum('duration'))['duration']
-
     @extend_schema_field(serializers.IntegerField(min_value=0, max_value=100))
     def get_completed_percentage(self, section):
-        user = self.context.get('request').user
-        if not user.is_authenticated:
+        progress = get_user_progress(self.context)
+        if not progress.is_authenticated:
             return 0
-        lesson_count = section.lesson_count
-        completed_lesson_count = CompletedLesson.objects.filter(user=user, lesson__section=section).count()
-        return completed_lesson_count * 100 // lesson_count if lesson_count > 0 else 0
+        return progress.section_percentage(section.id, section.lesson_count)
 
 
 class CoursePartSerializer(serializers.ModelSerializer):
@@ -52,7 +39,7 @@ class CoursePartSerializer(serializers.ModelSerializer):
 
     @staticmethod
     def get_lesson_count(part) -> int:
-        return part.lessons.count()
+        return part.lesson_count
 
     def get_price(self, part) -> int:
         return self.get_lesson_count(part) * part.course.lesson_price
@@ -64,15 +51,26 @@ class CoursePartSerializer(serializers.ModelSerializer):
 
     @extend_schema_field(CoursePartSectionsSerializer(many=True))
     def get_sections(self, part):
-        lessons = Lesson.objects.filter(part=part).select_related('section').prefetch_related('section__course')
-        self.context['lessons'] = lessons
-        section_ids = lessons.values_list('section', flat=True).distinct()
-        sections = Section.objects.filter(id__in=section_ids)
-        return CoursePartSectionsSerializer(sections, many=True, context=self.context).data
+        lessons = Lesson.objects.filter(part=part).select_related('section').order_by('section__order', 'order')
+        sections = {}
+        for lesson in lessons:
+            section = sections.get(lesson.section_id)
+            if section is None:
+                section = sections[lesson.section_id] = lesson.section
+                section.part_lessons, section.part_lesson_count, section.part_duration = [], 0, 0
+            lesson.section = section
+            section.part_lessons.append(lesson)
+            section.part_lesson_count += 1
+            section.part_duration += lesson.duration
+
+        # The completed percentage is over the whole section, not only this part.
+        lesson_counts = Section.objects.filter(id__in=sections).annotate(count=Count('lessons'))
+        for section_id, lesson_count in lesson_counts.values_list('id', 'count'):
+            sections[section_id]._lesson_count = lesson_count
+        return CoursePartSectionsSerializer(sections.values(), many=True, context=self.context).data
 
     def get_is_available(self, part) -> bool:
-        user = self.context.get('request').user
-        return user.is_authenticated and user.part_enrollments.filter(part=part).exists()
+        return get_user_progress(self.context).is_part_enrolled(part.id)
 
 
 class CoursePartListSerializer(CoursePartSerializer):
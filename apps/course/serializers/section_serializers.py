@@ -2,7 +2,8 @@ from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 from rest_framework.generics import get_object_or_404
 
-from apps.course.models import Section, Course, CompletedLesson
+from apps.course.models import Section, Course
+from apps.course.progress import get_user_progress
 from apps.course.serializers.lesson_serializers import LessonListSerializer
 
 
@@ -22,12 +23,10 @@ class SectionSerializer(serializers.ModelSerializer):
 
     @extend_schema_field(serializers.IntegerField(min_value=0, max_value=100))
     def get_completed_percentage(self, section):
-        user = self.context.get('request').user
-        if user.is_anonymous:
+        progress = get_user_progress(self.context)
+        if not progress.is_authenticated:
             return 0
-        lesson_count = section.lesson_count
-        completed_lesson_count = CompletedLesson.objects.filter(user=user, lesson__section=section).count()
-        return completed_lesson_count * 100 // lesson_count if lesson_count > 0 else 0
+        return progress.section_percentage(section.id, section.lesson_count)
 
     def create(self, validated_data):
         course_id = self.context.get('course_id')
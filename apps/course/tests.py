@@ -1,3 +1,480 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+
+from apps.accounts.models import TokenUser
+from apps.course.models import (
+    Category, Color, CompletedLesson, Course, CoursePart, CourseStats, Enrollment, Lesson, PartEnrollment, Section
+)
+from apps.course.utils import bulk_course_edit
+from apps.quiz.models import QuizGroup
+from apps.review.models import Review
+from config.cache import response_cache
+
+User = get_user_model()
+
+
+class CourseTestMixin:
+
+    def create_course(self, part_lesson_count=10):
+        self.teacher = User.objects.create_user(email='teacher@example.com', password='password!123')
+        self.category = Category.objects.create(name='Test Category')
+        self.color1 = Color.objects.create(name='Red', hex_code='#FF0000')
+        self.color2 = Color.objects.create(name='Blue', hex_code='#0000FF')
+        self.course = Course.objects.create(
+            title='Test Course',
+            description='Test Course Description',
+            category=self.category,
+            teacher=self.teacher,
+            image='path/to/image.jpg',
+            video='path/to/video.mp4',
+            color1=self.color1,
+            color2=self.color2,
+            part_lesson_count=part_lesson_count,
+            lesson_price=100,
+            discounted_lesson_price=80,
+        )
+        self.quiz_group = QuizGroup.objects.create(title='Test Quiz Group', course=self.course)
+        return self.course
+
+    def create_lessons(self, section, count, duration=10):
+        return [
+            Lesson.objects.create(
+                section=section, title=f'Lesson {num}', content='Content',
+                duration=duration, quiz_group=self.quiz_group
+            )
+            for num in range(count)
+        ]
+
+
+class CourseCatalogStatsTests(CourseTestMixin, TestCase):
+
+    def setUp(self):
+        self.create_course()
+        section = Section.objects.create(title='Section 1', course=self.course)
+        self.create_lessons(section, 3, duration=15)
+        self.student = User.objects.create_user(email='student@example.com', password='password!123')
+        Enrollment.objects.create(user=self.student, course=self.course)
+        Review.objects.create(user=self.student, course=self.course, rating=4)
+        Review.objects.create(user=self.teacher, course=self.course, rating=5)
+
+    def test_annotated_values_match_properties(self):
+        course = Course.objects.with_catalog_stats().get(pk=self.course.pk)
+        plain_course = Course.objects.get(pk=self.course.pk)
+        with self.assertNumQueries(0):
+            stats = (course.lesson_count, course.duration, course.student_count, course.review_count,
+                     course.average_rating, course.price, course.discounted_price)
+        self.assertEqual(stats, (
+            plain_course.lesson_count, plain_course.duration, plain_course.student_count, plain_course.review_count,
+            plain_course.average_rating, plain_course.price, plain_course.discounted_price
+        ))
+        self.assertEqual(course.lesson_count, 3)
+        self.assertEqual(course.duration, 45)
+
+    def test_list_query_count_is_fixed(self):
+        response_cache.cache.clear()
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('course-list'))
+        teacher = response.json()['results'][0]['teacher']
+        self.assertEqual((teacher['course_count'], teacher['student_count']), (1, 1))
+
+        other_teacher = User.objects.create_user(email='other@example.com', password='password!123')
+        for num, teacher in enumerate([self.teacher, other_teacher] * 3):
+            Course.objects.create(
+                title=f'Course {num}', description='Description', category=self.category, teacher=teacher,
+                color1=self.color1, color2=self.color2, lesson_price=100
+            )
+        response_cache.cache.clear()
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('course-list'))
+        self.assertEqual(len(response.json()['results']), 7)
+
+    def test_course_without_content(self):
+        Course.objects.exclude(pk=self.course.pk).delete()
+        empty_course = Course.objects.create(
+            title='Empty', description='Empty', category=self.category, teacher=self.teacher,
+            color1=self.color1, color2=self.color2, lesson_price=100
+        )
+        course = Course.objects.with_catalog_stats().get(pk=empty_course.pk)
+        self.assertEqual((course.lesson_count, course.duration, course.student_count), (0, 0, 0))
+        self.assertIsNone(course.average_rating)
+
+    def test_stats_follow_changes(self):
+        review = Review.objects.get(user=self.teacher)
+        review.rating = 1
+        review.save()
+        Review.objects.get(user=self.student).delete()
+        Lesson.objects.filter(section__course=self.course).first().delete()
+        Course.objects.filter(pk=self.course.pk).update(lesson_price=50)
+        self.course.refresh_from_db()
+        self.course.save()
+
+        stats = CourseStats.objects.get(course=self.course)
+        self.assertEqual((stats.lesson_count, stats.duration, stats.review_count, stats.rating_sum), (2, 30, 1, 1))
+        self.assertEqual(stats.price, 100)
+
+        CourseStats.objects.rebuild()
+        stats.refresh_from_db()
+        self.assertEqual((stats.lesson_count, stats.duration, stats.review_count, stats.rating_sum), (2, 30, 1, 1))
+
+    def test_moving_a_lesson_refreshes_both_courses(self):
+        other_course = Course.objects.create(
+            title='Other', description='Other', category=self.category, teacher=self.teacher,
+            color1=self.color1, color2=self.color2, lesson_price=100
+        )
+        lesson = Lesson.objects.filter(section__course=self.course).first()
+        lesson.section = Section.objects.create(title='Other section', course=other_course)
+        lesson.save()
+
+        self.assertEqual(
+            [(stats.lesson_count, stats.duration, stats.price) for stats in (
+                CourseStats.objects.get(course=self.course), CourseStats.objects.get(course=other_course)
+            )],
+            [(2, 30, 200), (1, 15, 100)]
+        )
+
+
+class UserProgressTests(CourseTestMixin, TestCase):
+
+    def setUp(self):
+        self.create_course()
+        self.section = Section.objects.create(title='Section 1', course=self.course)
+        self.lessons = Lesson.objects.filter(id__in=[
+            lesson.id for lesson in self.create_lessons(self.section, 4)
+        ]).order_by('order')
+        self.student = User.objects.create_user(email='student@example.com', password='password!123')
+        Enrollment.objects.create(user=self.student, course=self.course)
+        CompletedLesson.objects.create(user=self.student, lesson=self.lessons[0])
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+
+    def test_lesson_progress(self):
+        response = self.client.get(reverse('lesson-list', kwargs={'section_id': self.section.id}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([lesson['completed'] for lesson in response.data], [True, False, False, False])
+        self.assertEqual([lesson['is_available'] for lesson in response.data], [True, True, False, False])
+
+    def test_section_progress_query_count_is_constant(self):
+        url = reverse('section-list', kwargs={'course_id': self.course.id})
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.data[0]['completed_percentage'], 25)
+
+        self.create_lessons(self.section, 6)
+        with self.assertNumQueries(len(context.captured_queries)):
+            self.client.get(url)
+
+
+class ReorderingTests(CourseTestMixin, TestCase):
+
+    def setUp(self):
+        self.create_course()
+        self.first_section = Section.objects.create(title='Section 1', course=self.course)
+        self.second_section = Section.objects.create(title='Section 2', course=self.course)
+
+    def lesson_orders(self):
+        lessons = Lesson.objects.filter(section__course=self.course).order_by('section__order', 'order')
+        return list(lessons.values_list('title', 'order'))
+
+    def test_lessons_are_numbered_across_sections(self):
+        self.create_lessons(self.second_section, 2)
+        self.create_lessons(self.first_section, 1)
+        self.assertEqual(self.lesson_orders(), [('Lesson 0', 1), ('Lesson 0', 2), ('Lesson 1', 3)])
+
+        Lesson.objects.filter(section=self.second_section, order=2).get().delete()
+        self.assertEqual(self.lesson_orders(), [('Lesson 0', 1), ('Lesson 1', 2)])
+
+    def test_bulk_course_edit_reorders_once(self):
+        with bulk_course_edit():
+            self.create_lessons(self.second_section, 3)
+            self.create_lessons(self.first_section, 2)
+            self.first_section.delete()
+
+        self.assertEqual(list(self.course.sections.values_list('title', 'order')), [('Section 2', 1)])
+        self.assertEqual([order for _, order in self.lesson_orders()], [1, 2, 3])
+
+
+class PartingTests(CourseTestMixin, TestCase):
+
+    def setUp(self):
+        self.create_course(part_lesson_count=2)
+        self.section = Section.objects.create(title='Section 1', course=self.course)
+
+    def part_sizes(self):
+        parts = CoursePart.objects.filter(course=self.course).order_by('order')
+        return [part.lessons.count() for part in parts]
+
+    def test_lessons_are_split_into_parts(self):
+        self.create_lessons(self.section, 5)
+        self.assertEqual(self.part_sizes(), [2, 2, 1])
+
+        Lesson.objects.filter(section=self.section).first().delete()
+        self.assertEqual(self.part_sizes(), [2, 2])
+
+        self.course.part_lesson_count = 3
+        self.course.save()
+        self.assertEqual(self.part_sizes(), [3, 1])
+
+    def test_unchanged_lessons_are_not_rewritten(self):
+        self.create_lessons(self.section, 4)
+        with CaptureQueriesContext(connection) as context:
+            self.course.save()
+        self.assertFalse([query for query in context.captured_queries if query['sql'].startswith('UPDATE "lesson"')])
+
+    def test_bulk_course_edit_partitions_once(self):
+        with bulk_course_edit():
+            self.create_lessons(self.section, 5)
+            self.assertFalse(CoursePart.objects.filter(course=self.course).exists())
+        self.assertEqual(self.part_sizes(), [2, 2, 1])
+
+
+class CourseListPaginationTests(CourseTestMixin, TestCase):
+
+    def setUp(self):
+        self.create_course()
+        for num in range(4):
+            Course.objects.create(
+                title=f'Course {num}', description='Description', category=self.category,
+                teacher=self.teacher, color1=self.color1, color2=self.color2, lesson_price=100
+            )
+
+    def test_pages_follow_cursor(self):
+        url = reverse('course-list')
+        first_page = self.client.get(url, {'page_size': 3}).json()
+        self.assertEqual(len(first_page['results']), 3)
+        self.assertIsNone(first_page['previous'])
+
+        second_page = self.client.get(first_page['next']).json()
+        self.assertEqual(len(second_page['results']), 2)
+        self.assertIsNone(second_page['next'])
+
+        titles = [course['title'] for course in first_page['results'] + second_page['results']]
+        self.assertEqual(titles, list(Course.objects.values_list('title', flat=True)))
+
+
+class CourseDetailTests(CourseTestMixin, TestCase):
+
+    def setUp(self):
+        self.create_course(part_lesson_count=2)
+        self.section = Section.objects.create(title='Section 1', course=self.course)
+        self.lessons = self.create_lessons(self.section, 4)
+        self.student = User.objects.create_user(email='student@example.com', password='password!123')
+        Enrollment.objects.create(user=self.student, course=self.course)
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+        self.url = reverse('course-detail', kwargs={'course_id': self.course.id})
+
+    def test_parts_and_next_lesson(self):
+        parts = list(CoursePart.objects.filter(course=self.course))
+        PartEnrollment.objects.create(user=self.student, part=parts[1])
+        response = self.client.get(self.url)
+        self.assertEqual(
+            [(part['lesson_count'], part['price'], part['is_available']) for part in response.data['parts']],
+            [(2, 200, False), (2, 200, True)]
+        )
+        self.assertIsNone(response.data['last_available_lesson_id'])
+
+        CompletedLesson.objects.create(user=self.student, lesson=self.lessons[1])
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['last_available_lesson_id'], self.lessons[2].id)
+
+    def test_query_count_does_not_depend_on_parts(self):
+        CompletedLesson.objects.create(user=self.student, lesson=self.lessons[0])
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(self.url)
+
+        self.create_lessons(self.section, 20)
+        with self.assertNumQueries(len(context.captured_queries)):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data['parts']), 12)
+
+
+class CoursePartDetailTests(CourseTestMixin, TestCase):
+
+    def setUp(self):
+        self.create_course(part_lesson_count=4)
+        self.sections = [Section.objects.create(title=f'Section {num}', course=self.course) for num in range(2)]
+        self.lessons = self.create_lessons(self.sections[0], 3, duration=10) + self.create_lessons(self.sections[1], 3)
+        self.part = CoursePart.objects.get(course=self.course, order=1)
+        self.student = User.objects.create_user(email='student@example.com', password='password!123')
+        Enrollment.objects.create(user=self.student, course=self.course)
+        CompletedLesson.objects.create(user=self.student, lesson=self.lessons[0])
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+        self.url = reverse('part-detail', kwargs={'part_id': self.part.id})
+
+    def test_lessons_are_grouped_by_section(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['lesson_count'], 4)
+        self.assertEqual(
+            [(section['title'], section['lesson_count'], section['duration'], section['completed_percentage'])
+             for section in response.data['sections']],
+            [('Section 0', 3, 30, 33), ('Section 1', 1, 10, 0)]
+        )
+        self.assertEqual([lesson['completed'] for lesson in response.data['sections'][0]['lessons']],
+                         [True, False, False])
+
+    def test_query_count_does_not_depend_on_sections(self):
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(self.url)
+
+        with bulk_course_edit():
+            self.course.part_lesson_count = 10
+            self.course.save()
+            for num in range(3):
+                self.create_lessons(Section.objects.create(title=f'Extra {num}', course=self.course), 1)
+        with self.assertNumQueries(len(context.captured_queries)):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data['sections']), 5)
+
+
+class ResponseCacheTests(CourseTestMixin, TestCase):
+
+    def setUp(self):
+        response_cache.cache.clear()
+        self.create_course()
+        self.section = Section.objects.create(title='Section 1', course=self.course)
+        self.list_url = reverse('course-list')
+        self.detail_url = reverse('course-detail', kwargs={'course_id': self.course.id})
+
+    def test_anonymous_reads_are_served_from_cache(self):
+        response = self.client.get(self.list_url, {'page_size': 5})
+        with self.assertNumQueries(0):
+            cached_response = self.client.get(self.list_url, {'page_size': 5})
+        self.assertEqual(cached_response.content, response.content)
+        self.assertEqual(cached_response['Content-Type'], 'application/json')
+
+    def test_changes_invalidate_dependent_responses(self):
+        self.client.get(self.detail_url)
+        self.client.get(self.list_url)
+        self.create_lessons(self.section, 2)
+        self.assertEqual(self.client.get(self.detail_url).json()['lesson_count'], 2)
+        self.assertEqual(self.client.get(self.list_url).json()['results'][0]['lesson_count'], 2)
+
+        student = User.objects.create_user(email='student@example.com', password='password!123')
+        Review.objects.create(user=student, course=self.course, rating=4)
+        self.assertEqual(self.client.get(self.detail_url).json()['review_count'], 1)
+
+    def test_teacher_changes_through_proxy_invalidate(self):
+        self.client.get(self.detail_url)
+        teacher = TokenUser.from_claims(self.teacher.pk, self.teacher.email)
+        teacher.first_name = 'Changed'
+        teacher.save(update_fields=['first_name'])
+        self.assertEqual(self.client.get(self.detail_url).json()['teacher']['first_name'], 'Changed')
+
+    def test_enrollments_and_other_user_fields_keep_the_catalog(self):
+        self.client.get(self.list_url)
+        student = User.objects.create_user(email='student@example.com', password='password!123')
+        Enrollment.objects.create(user=student, course=self.course)
+        self.teacher.set_password('new-password!123')
+        with self.assertNumQueries(1):
+            self.teacher.save(update_fields=['password', 'password_version'])
+        with self.assertNumQueries(0):
+            self.client.get(self.list_url)
+
+    def test_unrelated_changes_keep_entries(self):
+        other_course = Course.objects.create(
+            title='Other', description='Other', category=self.category, teacher=self.teacher,
+            color1=self.color1, color2=self.color2, lesson_price=100
+        )
+        self.client.get(self.detail_url)
+        Section.objects.create(title='Other section', course=other_course)
+        with self.assertNumQueries(0):
+            self.client.get(self.detail_url)
+
+    def test_authenticated_reads_share_the_public_payload(self):
+        lessons = self.create_lessons(self.section, 4)
+        student = User.objects.create_user(email='student@example.com', password='password!123')
+        Enrollment.objects.create(user=student, course=self.course)
+        PartEnrollment.objects.create(user=student, part=CoursePart.objects.get(course=self.course))
+        CompletedLesson.objects.create(user=student, lesson=lessons[0])
+        anonymous_data = self.client.get(self.detail_url).json()
+
+        client = APIClient()
+        client.force_authenticate(student)
+        # The user's enrollments, part enrollments, completed lessons and next lesson.
+        with self.assertNumQueries(4):
+            response = client.get(self.detail_url)
+        self.assertEqual((response.data['enrolled'], response.data['completed_percentage']), (True, 25))
+        self.assertEqual(response.data['last_available_lesson_id'], lessons[1].id)
+        self.assertEqual([part['is_available'] for part in response.data['parts']], [True])
+        self.assertEqual(response.data['title'], anonymous_data['title'])
+
+        results = client.get(self.list_url).data['results']
+        self.assertEqual([(course['enrolled'], course['completed_percentage']) for course in results], [(True, 25)])
+        self.assertFalse(self.client.get(self.list_url).json()['results'][0]['enrolled'])
+        self.assertEqual(len(client.get(self.list_url, {'enrolled': False}).data['results']), 0)
+
+
+@override_settings(CONDITIONAL_RESPONSES=True)
+class ConditionalResponseTests(CourseTestMixin, TestCase):
+
+    def setUp(self):
+        response_cache.cache.clear()
+        self.create_course()
+        self.section = Section.objects.create(title='Section 1', course=self.course)
+        self.lessons = self.create_lessons(self.section, 2)
+        self.detail_url = reverse('course-detail', kwargs={'course_id': self.course.id})
+        self.section_url = reverse('section-detail', kwargs={'section_id': self.section.id})
+
+    def test_unchanged_content_is_not_modified(self):
+        response = self.client.get(self.detail_url)
+        self.assertIn('ETag', response)
+        with self.assertNumQueries(0):
+            not_modified = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+
+    @override_settings(CONDITIONAL_RESPONSES=False)
+    def test_disabled_without_a_shared_cache(self):
+        response = self.client.get(self.section_url)
+        self.assertNotIn('ETag', response)
+        self.assertEqual(self.client.get(self.section_url, HTTP_IF_NONE_MATCH='*').status_code, 200)
+
+    def test_last_modified_is_sent_once_its_second_is_over(self):
+        with mock.patch('config.cache.time') as clock:
+            clock.time.return_value = 1000.2
+            self.create_lessons(self.section, 1)
+            clock.time.return_value = 1000.5
+            self.assertNotIn('Last-Modified', self.client.get(self.section_url))
+
+            clock.time.return_value = 1000.7
+            self.create_lessons(self.section, 1)
+            clock.time.return_value = 1002
+            response = self.client.get(self.section_url)
+            self.assertEqual(response['Last-Modified'], http_date(1001))
+            with self.assertNumQueries(1):
+                not_modified = self.client.get(self.section_url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+            self.assertEqual(not_modified.status_code, 304)
+
+            clock.time.return_value = 1002.5
+            self.create_lessons(self.section, 1)
+            clock.time.return_value = 1004
+            response = self.client.get(self.section_url, HTTP_IF_MODIFIED_SINCE=http_date(1001))
+            self.assertEqual(response.status_code, 200)
+
+    def test_changes_give_new_etags(self):
+        etag = self.client.get(self.section_url)['ETag']
+        self.create_lessons(self.section, 1)
+        response = self.client.get(self.section_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_user_progress_is_part_of_the_etag(self):
+        student = User.objects.create_user(email='student@example.com', password='password!123')
+        client = APIClient()
+        client.force_authenticate(student)
+        anonymous_etag = self.client.get(self.section_url)['ETag']
+        etag = client.get(self.section_url)['ETag']
+        self.assertNotEqual(etag, anonymous_etag)
+
+        CompletedLesson.objects.create(user=student, lesson=self.lessons[0])
+        response = client.get(self.section_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['completed_percentage'], 50)
+        self.assertEqual(self.client.get(self.section_url, HTTP_IF_NONE_MATCH=anonymous_etag).status_code, 304)
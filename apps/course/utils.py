@@ -1,35 +1,152 @@
-from django.contrib.contenttypes.models import ContentType
+import threading
+from contextlib import contextmanager
 
+from django.apps import apps
+from django.db import transaction
+
+from config.cache import invalidate_tags
+
+_bulk_edit_state = threading.local()
+
+COURSE_ID_LOOKUPS = {
+    'Section': 'course_id',
+    'Lesson': 'section__course_id',
+    'CoursePart': 'course_id',
+}
 
-def reordering_sections(sections):
 
-    for num, section in enumerate(sections):
-        content_type = ContentType.objects.get_for_model(section)
-        obj = content_type.model_class().objects.filter(id=section.id)
-        order = num + 1
-        obj.update(order=order)
+def reordering(objects):
+    """Number ``objects`` from 1 in their current order, writing only the rows whose order changed."""
+    changed = []
+    for order, obj in enumerate(objects, start=1):
+        if obj.order != order:
+            obj.order = order
+            changed.append(obj)
+
+    if changed:
+        with transaction.atomic():
+            type(changed[0]).objects.bulk_update(changed, ['order'])
+
+
+def reordering_sections(sections):
+    reordering(sections)
 
 
 def reordering_lessons(lessons):
+    reordering(lessons)
 
-    for num, lesson in enumerate(lessons):
-        content_type = ContentType.objects.get_for_model(lesson)
-        obj = content_type.model_class().objects.filter(id=lesson.id)
-        order = num + 1
-        obj.update(order=order)
 
+def reordering_course_sections(course_id):
+    section_model = apps.get_model('course', 'Section')
+    reordering_sections(section_model.objects.filter(course_id=course_id).order_by('order').only('id', 'order'))
 
-def parting_course(course, lessons):
-    lessons_count = course.lesson_count
+
+def reordering_course_lessons(course_id):
+    lesson_model = apps.get_model('course', 'Lesson')
+    lessons = lesson_model.objects.filter(section__course_id=course_id).order_by('section__order', 'order')
+    reordering_lessons(lessons.only('id', 'order'))
+
+
+def parting_course(course):
+    """
+    Split the lessons of a course into parts of ``part_lesson_count`` lessons,
+    writing only the lessons whose part changed.
+    """
+    lesson_model = apps.get_model('course', 'Lesson')
+    course_part_model = apps.get_model('course', 'CoursePart')
     lessons_per_part = course.part_lesson_count
-    course_part_model = ContentType.objects.get(app_label="course", model="coursepart").model_class()
-    
-    for start_index in range(0, lessons_count, lessons_per_part):
-        end_index = start_index + lessons_per_part
-        order = start_index // lessons_per_part + 1
-        part, created = course_part_model.objects.get_or_create(course=course, order=order)
-        part.lessons.clear()
-        part.lessons.add(*lessons[start_index: end_index])
-
-    last_order = (lessons_count - 1) // lessons_per_part + 1
-    course_part_model.objects.filter(course=course, order__gt=last_order).delete()
+
+    lessons = list(
+        lesson_model.objects.filter(section__course=course).order_by('section__order', 'order')
+        .values_list('id', 'part_id')
+    )
+    part_count = (len(lessons) + lessons_per_part - 1) // lessons_per_part
+
+    with transaction.atomic():
+        parts = {part.order: part for part in course_part_model.objects.filter(course=course, order__lte=part_count)}
+        new_parts = [
+            course_part_model(course=course, order=order)
+            for order in range(1, part_count + 1) if order not in parts
+        ]
+        if new_parts:
+            course_part_model.objects.bulk_create(new_parts)
+            parts.update((part.order, part) for part in new_parts)
+
+        changed = []
+        for index, (lesson_id, part_id) in enumerate(lessons):
+            part = parts[index // lessons_per_part + 1]
+            if part_id != part.id:
+                changed.append(lesson_model(id=lesson_id, part=part))
+        if changed:
+            lesson_model.objects.bulk_update(changed, ['part'])
+
+        course_part_model.objects.filter(course=course, order__gt=part_count).delete()
+
+
+def parting_course_by_id(course_id):
+    course_model = apps.get_model('course', 'Course')
+    course = course_model.objects.filter(pk=course_id).only('id', 'part_lesson_count').first()
+    if course:
+        parting_course(course)
+
+
+COURSE_MAINTENANCE_JOBS = {
+    'sections': reordering_course_sections,
+    'lessons': reordering_course_lessons,
+    'parts': parting_course_by_id,
+}
+
+
+def schedule_course_maintenance(course_id, job):
+    """
+    Run a maintenance job of ``COURSE_MAINTENANCE_JOBS`` for a course now, or
+    once at the end of the enclosing ``bulk_course_edit`` block.
+    """
+    pending = getattr(_bulk_edit_state, 'pending', None)
+    if pending is None:
+        COURSE_MAINTENANCE_JOBS[job](course_id)
+    else:
+        pending.setdefault(course_id, set()).add(job)
+
+
+@contextmanager
+def bulk_course_edit():
+    """
+    Suspend the per-row maintenance done when sections and lessons change
+    (reordering and partitioning); every course touched inside the block is
+    maintained once on exit.
+    """
+    if getattr(_bulk_edit_state, 'pending', None) is not None:
+        yield
+        return
+
+    _bulk_edit_state.pending = {}
+    try:
+        yield
+        pending = _bulk_edit_state.pending
+    finally:
+        _bulk_edit_state.pending = None
+
+    with transaction.atomic():
+        for course_id, jobs in pending.items():
+            for job, func in COURSE_MAINTENANCE_JOBS.items():
+                if job in jobs:
+                    func(course_id)
+        if pending:
+            invalidate_tags(*(f'course:{course_id}' for course_id in pending))
+
+
+def course_lookup(model_name, url_argument):
+    """
+    Return a ``conditional_response`` lookup giving the ``course_id`` of the
+    ``model_name`` row named by ``url_argument``.
+    """
+
+    def lookup(**kwargs):
+        model = apps.get_model('course', model_name)
+        course_id = model.objects.filter(pk=kwargs[url_argument]).values_list(
+            COURSE_ID_LOOKUPS[model_name], flat=True
+        ).first()
+        return None if course_id is None else {'course_id': course_id}
+
+    return lookup
@@ -6,6 +6,7 @@ from rest_framework.response import Response
 
 from apps.course.models import Category
 from apps.course.serializers.category_serializers import CategorySerializer
+from config.cache import cache_response
 from config.permissons import IsAdminOrReadOnly
 
 
@@ -14,6 +15,7 @@ class CategoryList(APIView):
     permission_classes = IsAdminOrReadOnly,
 
     @extend_schema(tags=['Category'], responses={200: serializer_class(many=True)})
+    @cache_response('categories', 'courses')
     def get(self, request):
         categories = Category.objects.prefetch_related('courses')
         serializer = self.serializer_class(categories, many=True)
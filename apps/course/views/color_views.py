@@ -4,6 +4,7 @@ from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from config.cache import cache_response
 from config.permissons import IsAdminOrReadOnly
 from apps.course.models import Color
 from apps.course.serializers.color_serializers import ColorSerializer
@@ -14,6 +15,7 @@ class ColorList(APIView):
     permission_classes = IsAdminOrReadOnly,
 
     @extend_schema(tags=['Color'], responses={200: serializer_class(many=True)})
+    @cache_response('colors')
     def get(self, request):
         colors = Color.objects.all()
         serializer = self.serializer_class(colors, many=True, context={'request': request})
@@ -1,3 +1,4 @@
+from django.db.models import Count, Prefetch
 from django.shortcuts import get_object_or_404
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, extend_schema, OpenApiResponse
@@ -6,10 +7,17 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.course.filters import CourseFilter
-from apps.course.models import Course
+from apps.accounts.models import User
+from apps.course.models import Course, CoursePart
+from apps.course.progress import get_user_progress
 from apps.course.serializers.course_serializers import CourseListSerializer, CourseSerializer
+from config.cache import cache_response, conditional_response
+from config.pagination import CursorPaginationMixin, paginated
 from config.permissons import IsAdminOrReadOnly
 
+# Filters on the request user, whose results cannot be shared between users.
+COURSE_PRIVATE_PARAMETERS = 'enrolled', 'bookmarked', 'completed'
+
 COURSE_MANUAL_PARAMETERS = [
     OpenApiParameter('search', type=OpenApiTypes.STR, location=OpenApiParameter.QUERY, description="Searching"),
     OpenApiParameter('category', type=OpenApiTypes.STR, location=OpenApiParameter.QUERY, description="Category"),
@@ -24,17 +32,35 @@ COURSE_MANUAL_PARAMETERS = [
 ]
 
 
-class CourseList(APIView):
+def course_list_overlay(request, data):
+    progress = get_user_progress({'request': request})
+    for course in data['results']:
+        CourseListSerializer.add_user_fields(course, progress)
+
+
+def course_detail_overlay(request, data):
+    CourseSerializer.add_user_fields(data, get_user_progress({'request': request}))
+
+
+class CourseList(CursorPaginationMixin, APIView):
     serializer_class = CourseListSerializer
     permission_classes = IsAdminOrReadOnly,
+    ordering = '-created_at', '-id'
 
-    @extend_schema(tags=['Course'], parameters=COURSE_MANUAL_PARAMETERS, responses={200: serializer_class(many=True)})
+    @extend_schema(tags=['Course'], parameters=COURSE_MANUAL_PARAMETERS, responses={200: paginated(serializer_class)})
+    @cache_response(
+        'courses', 'categories', 'colors', 'teachers',
+        overlay=course_list_overlay, private_params=COURSE_PRIVATE_PARAMETERS
+    )
     def get(self, request):
-        courses = Course.objects.select_related('teacher', 'category').prefetch_related('sections')
+        courses = Course.objects.select_related('category', 'color1', 'color2').with_catalog_stats().prefetch_related(
+            Prefetch('teacher', queryset=User.objects.with_teacher_stats())
+        )
         course_filter = CourseFilter(data=request.GET, request=request, queryset=courses)
         filtered_courses = course_filter.qs if course_filter.is_valid() else courses.none()
-        serializer = self.serializer_class(filtered_courses, many=True, context={'request': request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        page = self.paginate_queryset(filtered_courses)
+        serializer = self.serializer_class(page, many=True, context={'request': request})
+        return self.get_paginated_response(serializer.data)
 
     @extend_schema(tags=['Course'], request=serializer_class(), responses={201: serializer_class()})
     def post(self, request):
@@ -50,8 +76,10 @@ class CourseDetail(APIView):
     permission_classes = IsAdminOrReadOnly,
 
     @extend_schema(tags=['Course'], responses={200: serializer_class()})
+    @conditional_response('course:{course_id}', 'categories', 'colors', 'teachers', user_tags=('progress:{user_id}',))
+    @cache_response('course:{course_id}', 'categories', 'colors', 'teachers', overlay=course_detail_overlay)
     def get(self, request, course_id):
-        course = self.get_course(course_id)
+        course = get_object_or_404(self.get_detail_queryset(), pk=course_id)
         serializer = self.serializer_class(course, context={'request': request})
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -72,3 +100,12 @@ class CourseDetail(APIView):
 
     def get_course(self, course_id):
         return get_object_or_404(Course, pk=course_id)
+
+    @staticmethod
+    def get_detail_queryset():
+        """Everything the course detail shows, in a fixed number of queries whatever the number of parts."""
+        parts = CoursePart.objects.annotate(_lesson_count=Count('lessons')).order_by('order')
+        return Course.objects.select_related('category', 'color1', 'color2').with_catalog_stats().prefetch_related(
+            Prefetch('teacher', queryset=User.objects.with_teacher_stats()),
+            Prefetch('parts', queryset=parts),
+        )
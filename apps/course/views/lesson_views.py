@@ -7,6 +7,8 @@ from rest_framework.permissions import IsAuthenticatedOrReadOnly
 
 from apps.course.models import Lesson, CompletedLesson
 from apps.course.serializers.lesson_serializers import LessonSerializer
+from apps.course.utils import course_lookup
+from config.cache import conditional_response
 from config.permissons import IsAdmin, IsAuth, IsAdminOrReadOnly
 
 
@@ -15,8 +17,11 @@ class LessonList(APIView):
     permission_classes = IsAdminOrReadOnly,
 
     @extend_schema(tags=['Lesson'], responses={200: serializer_class(many=True)})
+    @conditional_response(
+        'course:{course_id}', 'quizzes', 'videos', user_tags=('progress:{user_id}',), lookup=course_lookup('Section', 'section_id')
+    )
     def get(self, request, section_id):
-        lessons = Lesson.objects.filter(section_id=section_id)
+        lessons = Lesson.objects.filter(section_id=section_id).select_related('section')
         serializer = self.serializer_class(lessons, many=True, context={'request': request})
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -34,6 +39,9 @@ class LessonDetail(APIView):
     permission_classes = IsAdminOrReadOnly,
 
     @extend_schema(tags=['Lesson'], responses={200: serializer_class()})
+    @conditional_response(
+        'course:{course_id}', 'quizzes', 'videos', user_tags=('progress:{user_id}',), lookup=course_lookup('Lesson', 'lesson_id')
+    )
     def get(self, request, lesson_id):
         lesson = get_object_or_404(Lesson, pk=lesson_id)
         serializer = self.serializer_class(lesson, context={'request': request})
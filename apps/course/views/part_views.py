@@ -1,3 +1,4 @@
+from django.db.models import Count
 from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import extend_schema
 from rest_framework import status
@@ -7,6 +8,8 @@ from rest_framework.views import APIView
 
 from apps.course.models import CoursePart
 from apps.course.serializers.part_serializers import CoursePartSerializer
+from apps.course.utils import course_lookup
+from config.cache import conditional_response
 
 
 class CoursePartDetailView(APIView):
@@ -14,7 +17,9 @@ class CoursePartDetailView(APIView):
     permission_classes = AllowAny,
 
     @extend_schema(tags=['Course Part'], responses={200: serializer_class()})
+    @conditional_response('course:{course_id}', user_tags=('progress:{user_id}',), lookup=course_lookup('CoursePart', 'part_id'))
     def get(self, request, part_id):
-        part = get_object_or_404(CoursePart, pk=part_id)
+        parts = CoursePart.objects.select_related('course').annotate(_lesson_count=Count('lessons'))
+        part = get_object_or_404(parts, pk=part_id)
         serializer = self.serializer_class(part, context={'request': request})
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -6,6 +6,8 @@ from rest_framework.views import APIView
 
 from apps.course.models import Section
 from apps.course.serializers.section_serializers import SectionSerializer
+from apps.course.utils import course_lookup
+from config.cache import conditional_response
 from config.permissons import IsAdminOrReadOnly
 
 
@@ -14,8 +16,9 @@ class SectionList(APIView):
     serializer_class = SectionSerializer
 
     @extend_schema(tags=['Section'], responses={200: serializer_class(many=True)})
+    @conditional_response('course:{course_id}', user_tags=('progress:{user_id}',))
     def get(self, request, course_id):
-        sections = Section.objects.filter(course_id=course_id)
+        sections = Section.objects.filter(course_id=course_id).prefetch_related('lessons')
         serializer = self.serializer_class(sections, many=True, context={'request': request})
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -36,6 +39,7 @@ class SectionDetail(APIView):
     permission_classes = IsAdminOrReadOnly,
 
     @extend_schema(tags=['Section'], responses={200: serializer_class()})
+    @conditional_response('course:{course_id}', user_tags=('progress:{user_id}',), lookup=course_lookup('Section', 'section_id'))
     def get(self, request, section_id):
         section = self.get_section(section_id)
         serializer = self.serializer_class(section, context={'request': request})
@@ -0,0 +1,40 @@
+# Generated by Django 5.0.4 on 2026-10-18 13:09
+
+import config.utils
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('info', '0005_report'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='config',
+            name='id',
+            field=config.utils.CustomAutoField(editable=False, primary_key=True, serialize=False, start_id=1001),
+        ),
+        migrations.AlterField(
+            model_name='contact',
+            name='id',
+            field=config.utils.CustomAutoField(editable=False, primary_key=True, serialize=False, start_id=1001),
+        ),
+        migrations.AlterField(
+            model_name='faq',
+            name='id',
+            field=config.utils.CustomAutoField(editable=False, primary_key=True, serialize=False, start_id=1001),
+        ),
+        migrations.AlterField(
+            model_name='faqcategory',
+            name='id',
+            field=config.utils.CustomAutoField(editable=False, primary_key=True, serialize=False, start_id=11),
+        ),
+        migrations.AlterField(
+            model_name='report',
+            name='id',
+            field=config.utils.CustomAutoField(editable=False, primary_key=True, serialize=False, start_id=1001),
+        ),
+        config.utils.create_id_sequences('info'),
+    ]
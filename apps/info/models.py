@@ -1,8 +1,11 @@
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
 from apps.accounts.models import User
 from apps.course.models import Course
 from apps.quiz.models import Quiz
+from config.cache import invalidate_tags
 from config.utils import CustomAutoField
 
 
@@ -42,6 +45,18 @@ class FAQ(models.Model):
         ordering = 'id',
 
 
+@receiver(post_save, sender=FAQCategory)
+@receiver(post_delete, sender=FAQCategory)
+def faq_category_cache_signal(sender, instance, **kwargs):
+    invalidate_tags('faq-categories')
+
+
+@receiver(post_save, sender=FAQ)
+@receiver(post_delete, sender=FAQ)
+def faq_cache_signal(sender, instance, **kwargs):
+    invalidate_tags('faqs')
+
+
 class Contact(models.Model):
     id = CustomAutoField(primary_key=True, editable=False, start_id=1001)
     name = models.CharField(max_length=128)
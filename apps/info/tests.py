@@ -1,3 +1,32 @@
+from itertools import count
+from unittest import mock
+
+from django.db import connection, connections
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.info.models import Contact
+
+
+class SequenceIDTests(TestCase):
+
+    def test_save_inserts_without_update(self):
+        with CaptureQueriesContext(connection) as context:
+            contacts = [Contact(name=f'Contact {num}', link='https://example.com') for num in range(3)]
+            for contact in contacts:
+                contact.save()
+        statements = [query['sql'].split()[0] for query in context.captured_queries]
+        self.assertEqual(statements, ['SELECT', 'INSERT'] * 3)
+        self.assertEqual(list(Contact.objects.values_list('id', flat=True)), [contact.id for contact in contacts])
 
-# Create your tests here.
+    def test_sequence_values_are_taken_one_at_a_time(self):
+        field = Contact._meta.pk
+        values = count(1)
+        fetch_ids = mock.Mock(side_effect=lambda using, size: [next(values) for _ in range(size)])
+        contact = Contact(name='Contact', link='https://example.com')
+        with mock.patch.object(connections['default'], 'vendor', 'postgresql'), \
+                mock.patch.object(field, '_id_pools', {}), mock.patch.object(field, '_fetch_ids', fetch_ids):
+            self.assertEqual([field.next_id(contact) for _ in range(2)], [1, 2])
+            field.reserve_ids(3)
+            self.assertEqual([field.next_id(contact) for _ in range(4)], [3, 4, 5, 6])
+        self.assertEqual([call.args[1] for call in fetch_ids.call_args_list], [1, 1, 3, 1])
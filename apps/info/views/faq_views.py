@@ -8,6 +8,8 @@ from rest_framework.views import APIView
 from apps.info.filters import FAQFilter
 from apps.info.models import FAQCategory, FAQ
 from apps.info.serializers.faq_serializers import FAQCategorySerializer, FAQSerializer
+from config.cache import cache_response, conditional_response
+from config.pagination import CursorPaginationMixin, paginated
 from config.permissons import IsAdminOrReadOnly
 
 FAQ_MANUAL_PARAMETERS = [
@@ -25,6 +27,8 @@ class FAQCategoryListView(APIView):
         responses={200: FAQCategorySerializer(many=True)},
         description='Get all FAQ categories'
     )
+    @conditional_response('faq-categories')
+    @cache_response('faq-categories')
     def get(self, request):
         categories = FAQCategory.objects.all()
         serializer = FAQCategorySerializer(categories, many=True)
@@ -52,6 +56,7 @@ class FAQCategoryDetailView(APIView):
         responses={200: FAQCategorySerializer},
         description='Get FAQ category by id'
     )
+    @conditional_response('faq-categories')
     def get(self, request, category_id):
         category = self.get_category(category_id)
         serializer = FAQCategorySerializer(category)
@@ -85,22 +90,26 @@ class FAQCategoryDetailView(APIView):
         return get_object_or_404(FAQCategory, id=category_id)
 
 
-class FAQListView(APIView):
+class FAQListView(CursorPaginationMixin, APIView):
     serializer_class = FAQSerializer
     permission_classes = (IsAdminOrReadOnly,)
+    ordering = 'id'
 
     @extend_schema(
         tags=['FAQ'],
-        responses={200: FAQSerializer(many=True)},
+        responses={200: paginated(FAQSerializer)},
         parameters=FAQ_MANUAL_PARAMETERS,
         description='Get all FAQs'
     )
+    @conditional_response('faqs', 'faq-categories')
+    @cache_response('faqs', 'faq-categories')
     def get(self, request):
-        faqs = FAQ.objects.all()
+        faqs = FAQ.objects.select_related('category')
         faq_filter = FAQFilter(data=request.GET, request=request, queryset=faqs)
         filtered_faqs = faq_filter.qs if faq_filter.is_valid() else faqs.none()
-        serializer = FAQSerializer(filtered_faqs, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        page = self.paginate_queryset(filtered_faqs)
+        serializer = FAQSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
     @extend_schema(
         tags=['FAQ'],
@@ -124,6 +133,7 @@ class FAQDetailView(APIView):
         responses={200: FAQSerializer},
         description='Get FAQ by id'
     )
+    @conditional_response('faqs', 'faq-categories')
     def get(self, request, faq_id):
         faq = self.get_faq(faq_id)
         serializer = FAQSerializer(faq)
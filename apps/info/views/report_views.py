@@ -5,22 +5,25 @@ from rest_framework.views import APIView
 
 from apps.info.models import Report
 from apps.info.serializers.report_serializers import ReportSerializer
+from config.pagination import CursorPaginationMixin, paginated
 from config.permissons import IsAuth
 
 
-class ReportListView(APIView):
+class ReportListView(CursorPaginationMixin, APIView):
     serializer_class = ReportSerializer
     permission_classes = IsAuth,
+    ordering = 'id'
 
     @extend_schema(
         tags=['Report'],
-        responses={200: serializer_class(many=True)},
+        responses={200: paginated(serializer_class)},
         description='Report list'
     )
     def get(self, request):
         reports = Report.objects.all()
-        serializer = ReportSerializer(reports, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        page = self.paginate_queryset(reports)
+        serializer = ReportSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
     @extend_schema(
         tags=['Report'],
@@ -1,9 +1,25 @@
 from django.contrib import admin
 
-from apps.notification.models import Notification
+from apps.notification.models import Notification, NotificationBroadcast, NotificationMessage
 
 
-@admin.register(Notification)
-class NotificationAdmin(admin.ModelAdmin):
+@admin.register(NotificationMessage)
+class NotificationMessageAdmin(admin.ModelAdmin):
     list_display = ('title', 'image', 'created_at')
     list_display_links = 'title',
+
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ('message', 'user', 'is_read', 'created_at')
+    list_display_links = 'message',
+    list_select_related = 'message', 'user'
+    raw_id_fields = 'message', 'user'
+
+
+@admin.register(NotificationBroadcast)
+class NotificationBroadcastAdmin(admin.ModelAdmin):
+    list_display = ('message', 'status', 'delivered', 'total', 'created_at')
+    list_display_links = 'message',
+    list_select_related = 'message',
+    readonly_fields = ('status', 'total', 'delivered', 'finished_at')
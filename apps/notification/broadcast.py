@@ -0,0 +1,78 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.notification.models import Notification, NotificationBroadcast, NotificationCounter
+from apps.notification.push import push_broadcast
+
+BROADCAST_CHUNK_SIZE = 1000
+BROADCAST_LEASE_TIMEOUT = timedelta(minutes=5)
+
+
+def _remaining_users(broadcast):
+    users = User.objects.order_by('id').values_list('id', flat=True)
+    if broadcast.last_user_id is not None:
+        users = users.filter(id__gt=broadcast.last_user_id)
+    return users
+
+
+def claimable_broadcasts(retry_failed=False):
+    """
+    Broadcasts a worker may take: pending ones, and running ones whose worker
+    has not reported progress within ``NOTIFICATION_BROADCAST_LEASE_TIMEOUT``.
+    """
+    status = NotificationBroadcast.Status
+    lease_timeout = getattr(settings, 'NOTIFICATION_BROADCAST_LEASE_TIMEOUT', BROADCAST_LEASE_TIMEOUT)
+    claimable = Q(status=status.PENDING) | (Q(status=status.RUNNING) & (
+        Q(heartbeat_at__isnull=True) | Q(heartbeat_at__lt=timezone.now() - lease_timeout)
+    ))
+    if retry_failed:
+        claimable |= Q(status=status.FAILED)
+    return NotificationBroadcast.objects.filter(claimable)
+
+
+def send_broadcast(broadcast_id, chunk_size=None, retry_failed=False):
+    """
+    Deliver a broadcast to every user, ``chunk_size`` users per transaction.
+
+    The broadcast is claimed first and ``None`` is returned if another worker
+    holds it. Each chunk is written with one ``bulk_create`` together with the
+    progress and heartbeat of the locked broadcast row, so an interrupted
+    broadcast resumes after the last delivered user and two workers never
+    deliver the same chunk.
+    """
+    chunk_size = chunk_size or getattr(settings, 'NOTIFICATION_BROADCAST_CHUNK_SIZE', BROADCAST_CHUNK_SIZE)
+    claimed = claimable_broadcasts(retry_failed).filter(id=broadcast_id).update(
+        status=NotificationBroadcast.Status.RUNNING, heartbeat_at=timezone.now()
+    )
+    if not claimed:
+        return None
+
+    broadcast = NotificationBroadcast.objects.get(id=broadcast_id)
+    broadcast.total = broadcast.delivered + _remaining_users(broadcast).count()
+    broadcast.save(update_fields=['total'])
+
+    while True:
+        with transaction.atomic():
+            broadcast = NotificationBroadcast.objects.select_for_update().get(id=broadcast_id)
+            user_ids = list(_remaining_users(broadcast)[:chunk_size])
+            if not user_ids:
+                break
+            Notification.objects.bulk_create([
+                Notification(user_id=user_id, message_id=broadcast.message_id) for user_id in user_ids
+            ])
+            NotificationCounter.objects.increment(user_ids, total_count=1, unread_count=1)
+            broadcast.last_user_id = user_ids[-1]
+            broadcast.delivered += len(user_ids)
+            broadcast.heartbeat_at = timezone.now()
+            broadcast.save(update_fields=['last_user_id', 'delivered', 'heartbeat_at'])
+
+    broadcast.status = NotificationBroadcast.Status.DONE
+    broadcast.finished_at = timezone.now()
+    broadcast.save(update_fields=['status', 'finished_at'])
+    push_broadcast()
+    return broadcast
@@ -0,0 +1,110 @@
+import asyncio
+import random
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+from apps.chat.consumers import CustomHttpRequest
+from apps.notification.models import Notification, NotificationCounter
+from apps.notification.push import BROADCAST_GROUP_NAME, user_group_name
+from apps.notification.serializers import NotificationListSerializer
+
+CATCH_UP_LIMIT = 100
+BROADCAST_FETCH_SPREAD = 30
+
+
+class NotificationConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Pushes new notifications and unread counts of the connected user.
+
+    Clients pass the id of the last notification they have as ``after`` and
+    receive the ones they missed. Every push sends what is newer than the
+    last notification sent on this socket. A broadcast reaches every socket at
+    once, so each one waits a random delay of up to
+    ``NOTIFICATION_BROADCAST_FETCH_SPREAD`` seconds before fetching.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.user = None
+        self.group_name = None
+        self.cursor = None
+
+    async def connect(self):
+        self.user = self.scope['user']
+        if not self.user.is_authenticated:
+            await self.close()
+            return
+
+        self.group_name = user_group_name(self.user.pk)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.channel_layer.group_add(BROADCAST_GROUP_NAME, self.channel_name)
+        await self.accept(subprotocol=self.scope.get('auth_subprotocol'))
+
+        after = parse_qs(self.scope.get('query_string', b'').decode()).get('after')
+        self.cursor = await self.get_cursor(after[0] if after else None)
+        if after:
+            await self.send_new_notifications()
+        await self.send_count()
+
+    async def disconnect(self, close_code):
+        if self.group_name is None:
+            return
+        await self.channel_layer.group_discard(self.group_name, self.channel_name)
+        await self.channel_layer.group_discard(BROADCAST_GROUP_NAME, self.channel_name)
+
+    async def notification_new(self, event):
+        if await self.send_new_notifications():
+            await self.send_count()
+
+    async def notification_broadcast(self, event):
+        spread = getattr(settings, 'NOTIFICATION_BROADCAST_FETCH_SPREAD', BROADCAST_FETCH_SPREAD)
+        await asyncio.sleep(random.uniform(0, spread))
+        await self.notification_new(event)
+
+    async def notification_count(self, event):
+        await self.send_json({
+            'type': 'count', 'unread_count': event['unread_count'], 'total_count': event['total_count']
+        })
+
+    async def send_new_notifications(self):
+        notifications = await self.get_new_notifications()
+        for notification in notifications:
+            await self.send_json({'type': 'notification', 'notification': notification})
+        return len(notifications)
+
+    async def send_count(self):
+        counter = await database_sync_to_async(NotificationCounter.for_user)(self.user)
+        await self.notification_count({'unread_count': counter.unread_count, 'total_count': counter.total_count})
+
+    @database_sync_to_async
+    def get_cursor(self, notification_id):
+        """The notification ``after`` points to, or the latest one if it is not one of the user's."""
+        notifications = Notification.objects.filter(user=self.user).order_by('-created_at', '-id')
+        notifications = notifications.values_list('created_at', 'id')
+        if notification_id:
+            try:
+                cursor = notifications.filter(id=notification_id).first()
+            except ValidationError:
+                cursor = None
+            if cursor is not None:
+                return cursor
+        return notifications.first()
+
+    @database_sync_to_async
+    def get_new_notifications(self):
+        notifications = Notification.objects.filter(user=self.user).select_related('message')
+        if self.cursor is not None:
+            created_at, notification_id = self.cursor
+            notifications = notifications.filter(
+                Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=notification_id)
+            )
+        notifications = list(notifications.order_by('created_at', 'id')[:CATCH_UP_LIMIT])
+        if notifications:
+            self.cursor = notifications[-1].created_at, notifications[-1].id
+        context = {'request': CustomHttpRequest(self.scope)}
+        return NotificationListSerializer(notifications, many=True, context=context).data
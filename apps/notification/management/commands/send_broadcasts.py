@@ -0,0 +1,41 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.notification.broadcast import claimable_broadcasts, send_broadcast
+from apps.notification.models import NotificationBroadcast
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        'Send pending notification broadcasts, and resume the ones whose worker stopped. '
+        'Run it with --interval as the broadcast worker.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float, help='Keep running and look for broadcasts every INTERVAL seconds'
+        )
+        parser.add_argument('--retry-failed', action='store_true', help='Also retry broadcasts that failed')
+
+    def handle(self, *args, **options):
+        while True:
+            self.send_broadcasts(options['retry_failed'])
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
+
+    def send_broadcasts(self, retry_failed):
+        broadcast_ids = claimable_broadcasts(retry_failed).order_by('created_at').values_list('id', flat=True)
+        for broadcast_id in list(broadcast_ids):
+            try:
+                broadcast = send_broadcast(broadcast_id, retry_failed=retry_failed)
+            except Exception:
+                logger.exception('Notification broadcast %s failed', broadcast_id)
+                NotificationBroadcast.objects.filter(id=broadcast_id).update(status=NotificationBroadcast.Status.FAILED)
+                continue
+            if broadcast is not None:
+                self.stdout.write(f'{broadcast}: {broadcast.delivered} notification(s) delivered')
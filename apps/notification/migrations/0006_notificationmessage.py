@@ -0,0 +1,69 @@
+# Generated by Django 5.0.4 on 2026-10-18 13:19
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def move_content_to_messages(apps, schema_editor):
+    Notification = apps.get_model('notification', 'Notification')
+    NotificationBroadcast = apps.get_model('notification', 'NotificationBroadcast')
+    NotificationMessage = apps.get_model('notification', 'NotificationMessage')
+
+    # Broadcast copies share the same content, so they share one message.
+    contents = Notification.objects.values('title', 'body', 'type', 'image').annotate(created_at=Min('created_at'))
+    for content in contents.order_by():
+        created_at = content.pop('created_at')
+        message = NotificationMessage.objects.create(**content)
+        NotificationMessage.objects.filter(id=message.id).update(created_at=created_at)
+        Notification.objects.filter(message__isnull=True, **content).update(message=message)
+
+    for broadcast in NotificationBroadcast.objects.filter(message__isnull=True):
+        broadcast.message = NotificationMessage.objects.create(
+            title=broadcast.title, body=broadcast.body, type=broadcast.type, image=broadcast.image
+        )
+        broadcast.save(update_fields=['message'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notification', '0005_notificationbroadcast'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationMessage',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=255)),
+                ('body', models.TextField()),
+                ('type', models.CharField(choices=[('special', 'Special'), ('general', 'General'), ('payment', 'Payment'), ('update', 'Update')], max_length=10)),
+                ('image', models.ImageField(null=True, upload_to='notification/')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Notification message',
+                'verbose_name_plural': 'Notification messages',
+                'db_table': 'notification_messages',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='is_read',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='message',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to='notification.notificationmessage'),
+        ),
+        migrations.AddField(
+            model_name='notificationbroadcast',
+            name='message',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='broadcasts', to='notification.notificationmessage'),
+        ),
+        migrations.RunPython(move_content_to_messages, migrations.RunPython.noop),
+    ]
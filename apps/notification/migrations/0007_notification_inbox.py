@@ -0,0 +1,100 @@
+# Generated by Django 5.0.4 on 2026-10-18 13:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def copy_content_from_messages(apps, schema_editor):
+    Notification = apps.get_model('notification', 'Notification')
+    NotificationBroadcast = apps.get_model('notification', 'NotificationBroadcast')
+    NotificationMessage = apps.get_model('notification', 'NotificationMessage')
+
+    for message in NotificationMessage.objects.all():
+        content = {'title': message.title, 'body': message.body, 'type': message.type, 'image': message.image}
+        Notification.objects.filter(message=message).update(**content)
+        NotificationBroadcast.objects.filter(message=message).update(**content)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notification', '0006_notificationmessage'),
+    ]
+
+    # The content columns are made nullable first, so that unapplying this
+    # migration can add them back before the content is copied into them.
+    operations = [
+        migrations.AlterField(
+            model_name='notification',
+            name='title',
+            field=models.CharField(max_length=255, null=True),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='body',
+            field=models.TextField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='type',
+            field=models.CharField(choices=[('special', 'Special'), ('general', 'General'), ('payment', 'Payment'), ('update', 'Update')], max_length=10, null=True),
+        ),
+        migrations.AlterField(
+            model_name='notificationbroadcast',
+            name='title',
+            field=models.CharField(max_length=255, null=True),
+        ),
+        migrations.AlterField(
+            model_name='notificationbroadcast',
+            name='body',
+            field=models.TextField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='notificationbroadcast',
+            name='type',
+            field=models.CharField(choices=[('special', 'Special'), ('general', 'General'), ('payment', 'Payment'), ('update', 'Update')], max_length=10, null=True),
+        ),
+        migrations.RunPython(migrations.RunPython.noop, copy_content_from_messages),
+        migrations.RemoveField(
+            model_name='notification',
+            name='body',
+        ),
+        migrations.RemoveField(
+            model_name='notification',
+            name='image',
+        ),
+        migrations.RemoveField(
+            model_name='notification',
+            name='title',
+        ),
+        migrations.RemoveField(
+            model_name='notification',
+            name='type',
+        ),
+        migrations.RemoveField(
+            model_name='notificationbroadcast',
+            name='body',
+        ),
+        migrations.RemoveField(
+            model_name='notificationbroadcast',
+            name='image',
+        ),
+        migrations.RemoveField(
+            model_name='notificationbroadcast',
+            name='title',
+        ),
+        migrations.RemoveField(
+            model_name='notificationbroadcast',
+            name='type',
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='message',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to='notification.notificationmessage'),
+        ),
+        migrations.AlterField(
+            model_name='notificationbroadcast',
+            name='message',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='broadcasts', to='notification.notificationmessage'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.0.4 on 2026-10-18 13:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def fill_counters(apps, schema_editor):
+    Notification = apps.get_model('notification', 'Notification')
+    NotificationCounter = apps.get_model('notification', 'NotificationCounter')
+
+    counts = Notification.objects.order_by().values('user_id').annotate(
+        total=Count('id'), unread=Count('id', filter=Q(is_read=False))
+    )
+    NotificationCounter.objects.bulk_create([
+        NotificationCounter(user_id=count['user_id'], total_count=count['total'], unread_count=count['unread'])
+        for count in counts
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_alter_user_phone_number'),
+        ('notification', '0007_notification_inbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationCounter',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='notification_counter', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('total_count', models.PositiveIntegerField(default=0)),
+                ('unread_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Notification counter',
+                'verbose_name_plural': 'Notification counters',
+                'db_table': 'notification_counters',
+            },
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.4 on 2026-10-18 14:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notification', '0008_notificationcounter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notificationbroadcast',
+            name='heartbeat_at',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+    ]
@@ -1,9 +1,17 @@
 from uuid import uuid4
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
 
+from apps.notification.push import push_new_notification, push_unread_count
+
+
+class NotificationMessage(models.Model):
+    """Content of a notification, shared by all of its recipients."""
 
-class Notification(models.Model):
     class Type(models.TextChoices):
         SPECIAL = 'special', 'Special'
         GENERAL = 'general', 'General'
@@ -11,15 +19,168 @@ class Notification(models.Model):
         UPDATE = 'update', 'Update'
 
     id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
-    user = models.ForeignKey('accounts.User', on_delete=models.CASCADE, related_name='notifications')
     title = models.CharField(max_length=255)
     body = models.TextField()
     type = models.CharField(max_length=10, choices=Type.choices)
     image = models.ImageField(upload_to='notification/', null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        db_table = 'notification_messages'
+        verbose_name = 'Notification message'
+        verbose_name_plural = 'Notification messages'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return self.title
+
+
+class NotificationQuerySet(models.QuerySet):
+
+    def mark_read(self, user):
+        """Mark the unread notifications of ``user`` in this queryset as read and return their count."""
+        with transaction.atomic():
+            count = self.filter(user=user, is_read=False).update(is_read=True)
+            if count:
+                NotificationCounter.objects.decrement(user.pk, unread_count=count)
+                push_unread_count(user.pk)
+        return count
+
+
+class Notification(models.Model):
+    Type = NotificationMessage.Type
+
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    user = models.ForeignKey('accounts.User', on_delete=models.CASCADE, related_name='notifications')
+    message = models.ForeignKey(NotificationMessage, on_delete=models.CASCADE, related_name='notifications')
+    is_read = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = NotificationQuerySet.as_manager()
+
     class Meta:
         db_table = 'notifications'
         verbose_name = 'Notification'
         verbose_name_plural = 'Notifications'
         ordering = ['-created_at']
+        indexes = [models.Index(fields=['user', '-created_at'], name='notification_user_created_idx')]
+
+
+class NotificationBroadcast(models.Model):
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        RUNNING = 'running', 'Running'
+        DONE = 'done', 'Done'
+        FAILED = 'failed', 'Failed'
+
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    created_by = models.ForeignKey('accounts.User', on_delete=models.SET_NULL, null=True, related_name='+')
+    message = models.ForeignKey(NotificationMessage, on_delete=models.CASCADE, related_name='broadcasts')
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    total = models.PositiveIntegerField(default=0)
+    delivered = models.PositiveIntegerField(default=0)
+    last_user_id = models.UUIDField(null=True, editable=False)
+    heartbeat_at = models.DateTimeField(null=True, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True)
+
+    class Meta:
+        db_table = 'notification_broadcasts'
+        verbose_name = 'Notification broadcast'
+        verbose_name_plural = 'Notification broadcasts'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return self.message.title
+
+
+class NotificationCounterQuerySet(models.QuerySet):
+
+    def increment(self, user_ids, **deltas):
+        """Shift the counters of the given users, creating missing rows, in two queries."""
+        self.bulk_create([NotificationCounter(user_id=user_id) for user_id in user_ids], ignore_conflicts=True)
+        return self.filter(user_id__in=user_ids).update(
+            **{field: F(field) + delta for field, delta in deltas.items()}
+        )
+
+    def decrement(self, user_id, **deltas):
+        """Lower the counters of a user, never below zero."""
+        return self.filter(user_id=user_id).update(
+            **{field: Greatest(F(field) - delta, 0) for field, delta in deltas.items()}
+        )
+
+    def decrement_for_message(self, message_id):
+        """Take the notifications of a message off the counters of their users, in one UPDATE."""
+        notifications = Notification.objects.filter(message_id=message_id)
+        user_notifications = notifications.filter(user=OuterRef('user')).order_by().values('user')
+
+        def count(queryset):
+            return Coalesce(Subquery(queryset.annotate(count=Count('id')).values('count')), 0)
+
+        return self.filter(user_id__in=notifications.values('user_id')).update(
+            total_count=Greatest(F('total_count') - count(user_notifications), 0),
+            unread_count=Greatest(F('unread_count') - count(user_notifications.filter(is_read=False)), 0),
+        )
+
+    def rebuild(self, user_ids=None):
+        """Recompute the counters of ``user_ids`` (all users by default) from the inbox."""
+        notifications = Notification.objects.all()
+        if user_ids is not None:
+            notifications = notifications.filter(user_id__in=user_ids)
+        counts = notifications.order_by().values('user_id').annotate(
+            total=Count('id'), unread=Count('id', filter=Q(is_read=False))
+        )
+        counters = [
+            NotificationCounter(user_id=count['user_id'], total_count=count['total'], unread_count=count['unread'])
+            for count in counts
+        ]
+        return self.bulk_create(
+            counters, update_conflicts=True, unique_fields=['user'], update_fields=['total_count', 'unread_count']
+        )
+
+
+class NotificationCounter(models.Model):
+    user = models.OneToOneField('accounts.User', on_delete=models.CASCADE, primary_key=True,
+                                related_name='notification_counter')
+    total_count = models.PositiveIntegerField(default=0)
+    unread_count = models.PositiveIntegerField(default=0)
+
+    objects = NotificationCounterQuerySet.as_manager()
+
+    class Meta:
+        db_table = 'notification_counters'
+        verbose_name = 'Notification counter'
+        verbose_name_plural = 'Notification counters'
+
+    @classmethod
+    def for_user(cls, user):
+        try:
+            return cls.objects.get(user=user)
+        except cls.DoesNotExist:
+            return cls(user=user)
+
+
+@receiver(post_save, sender=Notification)
+def notification_counter_save_signal(sender, instance, created, **kwargs):
+    if created:
+        NotificationCounter.objects.increment([instance.user_id], total_count=1, unread_count=int(not instance.is_read))
+        push_new_notification(instance.user_id)
+
+
+def deleted_with_message(origin):
+    if isinstance(origin, models.QuerySet):
+        return origin.model is NotificationMessage
+    return isinstance(origin, NotificationMessage)
+
+
+@receiver(pre_delete, sender=NotificationMessage)
+def message_counter_delete_signal(sender, instance, **kwargs):
+    NotificationCounter.objects.decrement_for_message(instance.pk)
+
+
+@receiver(post_delete, sender=Notification)
+def notification_counter_delete_signal(sender, instance, origin=None, **kwargs):
+    # Notifications deleted along with their message are counted by message_counter_delete_signal.
+    if deleted_with_message(origin):
+        return
+    NotificationCounter.objects.decrement(instance.user_id, total_count=1, unread_count=int(not instance.is_read))
@@ -0,0 +1,41 @@
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.apps import apps
+from django.db import transaction
+
+
+BROADCAST_GROUP_NAME = 'notifications'
+
+
+def user_group_name(user_id):
+    return f'notifications_{user_id}'
+
+
+def send_to_group(group_name, event):
+    channel_layer = get_channel_layer()
+    if channel_layer is not None:
+        async_to_sync(channel_layer.group_send)(group_name, event)
+
+
+def send_to_user(user_id, event):
+    send_to_group(user_group_name(user_id), event)
+
+
+def push_unread_count(user_id):
+    """Send the unread count of a user to their open sockets once the current transaction commits."""
+    counter_model = apps.get_model('notification', 'NotificationCounter')
+
+    def push():
+        counts = counter_model.objects.filter(user_id=user_id).values('unread_count', 'total_count').first()
+        send_to_user(user_id, {'type': 'notification.count', **(counts or {'unread_count': 0, 'total_count': 0})})
+
+    transaction.on_commit(push)
+
+
+def push_new_notification(user_id):
+    transaction.on_commit(lambda: send_to_user(user_id, {'type': 'notification.new'}))
+
+
+def push_broadcast():
+    """Let every open socket fetch its new notifications, once a broadcast has been delivered to all users."""
+    transaction.on_commit(lambda: send_to_group(BROADCAST_GROUP_NAME, {'type': 'notification.broadcast'}))
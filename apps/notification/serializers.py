@@ -1,27 +1,50 @@
 from rest_framework import serializers
 
-from apps.accounts.models import User
-from apps.notification.models import Notification
+from apps.notification.models import Notification, NotificationBroadcast, NotificationCounter, NotificationMessage
 from config.utils import TimestampField
 
 
 class NotificationSerializer(serializers.ModelSerializer):
+    title = serializers.CharField(source='message.title', read_only=True)
+    body = serializers.CharField(source='message.body', read_only=True)
+    type = serializers.ChoiceField(source='message.type', choices=NotificationMessage.Type.choices, read_only=True)
+    image = serializers.ImageField(source='message.image', read_only=True)
     created_at = TimestampField(read_only=True)
 
     class Meta:
         model = Notification
-        fields = ['id', 'title', 'body', 'type', 'image', 'created_at']
-
-    def create(self, validated_data):
-        admin_user = self.context.get('request').user
-        all_users = User.objects.all()
-        for user in all_users:
-            Notification.objects.create(user=user, **validated_data)
-        return Notification.objects.filter(user=admin_user).first()
+        fields = ['id', 'title', 'body', 'type', 'image', 'is_read', 'created_at']
 
 
 class NotificationListSerializer(NotificationSerializer):
 
     class Meta:
         model = Notification
-        fields = ['id', 'title', 'image', 'type', 'created_at']
+        fields = ['id', 'title', 'image', 'type', 'is_read', 'created_at']
+
+
+class NotificationSummarySerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = NotificationCounter
+        fields = ['unread_count', 'total_count']
+
+
+class NotificationBroadcastSerializer(serializers.ModelSerializer):
+    title = serializers.CharField(source='message.title', max_length=255)
+    body = serializers.CharField(source='message.body')
+    type = serializers.ChoiceField(source='message.type', choices=NotificationMessage.Type.choices)
+    image = serializers.ImageField(source='message.image', required=False, allow_null=True)
+    created_at = TimestampField(read_only=True)
+    finished_at = TimestampField(read_only=True)
+
+    class Meta:
+        model = NotificationBroadcast
+        fields = ['id', 'title', 'body', 'type', 'image', 'status', 'total', 'delivered', 'created_at', 'finished_at']
+        read_only_fields = ['status', 'total', 'delivered']
+
+    def create(self, validated_data):
+        message = NotificationMessage.objects.create(**validated_data.pop('message'))
+        return NotificationBroadcast.objects.create(
+            message=message, created_by=self.context['request'].user, **validated_data
+        )
@@ -1,3 +1,233 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from channels.db import database_sync_to_async
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser, Group
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.notification.broadcast import send_broadcast
+from apps.notification.models import Notification, NotificationBroadcast, NotificationCounter, NotificationMessage
+from apps.notification.routing import websocket_urlpatterns
+
+User = get_user_model()
+
+
+class NotificationBroadcastTests(TestCase):
+
+    def setUp(self):
+        self.admin = User.objects.create_user(email='admin@example.com', password='password!123')
+        self.admin.groups.add(Group.objects.create(name='admin'))
+        for num in range(4):
+            User.objects.create_user(email=f'user{num}@example.com', password='password!123')
+        self.message = NotificationMessage.objects.create(title='Title', body='Body', type='general')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_post_returns_before_delivery(self):
+        data = {'title': 'Title', 'body': 'Body', 'type': 'general'}
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('notification-list'), data)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['status'], NotificationBroadcast.Status.PENDING)
+        self.assertFalse(Notification.objects.exists())
+
+        url = reverse('notification-broadcast-detail', kwargs={'broadcast_id': response.data['id']})
+        self.assertEqual(self.client.get(url).data['status'], NotificationBroadcast.Status.PENDING)
+        call_command('send_broadcasts', stdout=StringIO())
+        self.assertEqual(self.client.get(url).data['status'], NotificationBroadcast.Status.DONE)
+        self.assertEqual(Notification.objects.count(), 5)
+
+    def test_running_broadcasts_are_reclaimed_after_the_lease(self):
+        running = NotificationBroadcast.Status.RUNNING
+        live = NotificationBroadcast.objects.create(message=self.message, status=running, heartbeat_at=timezone.now())
+        stale = NotificationBroadcast.objects.create(
+            message=self.message, status=running, heartbeat_at=timezone.now() - timedelta(minutes=10)
+        )
+        self.assertIsNone(send_broadcast(live.id))
+        call_command('send_broadcasts', stdout=StringIO())
+
+        live.refresh_from_db()
+        stale.refresh_from_db()
+        self.assertEqual((live.status, live.delivered), (running, 0))
+        self.assertEqual((stale.status, stale.delivered), (NotificationBroadcast.Status.DONE, 5))
+
+    def test_send_broadcast_in_chunks(self):
+        broadcast = NotificationBroadcast.objects.create(message=self.message)
+        with CaptureQueriesContext(connection) as context:
+            broadcast = send_broadcast(broadcast.id, chunk_size=2)
+        inserts = [query for query in context.captured_queries if query['sql'].startswith('INSERT INTO "notifications"')]
+        self.assertEqual(len(inserts), 3)
+        self.assertEqual((broadcast.status, broadcast.total, broadcast.delivered), ('done', 5, 5))
+        self.assertEqual(Notification.objects.filter(message=broadcast.message).count(), 5)
+
+    def test_send_broadcast_resumes(self):
+        broadcast = NotificationBroadcast.objects.create(message=self.message)
+        first_user = User.objects.order_by('id').first()
+        Notification.objects.create(user=first_user, message=self.message)
+        NotificationBroadcast.objects.filter(id=broadcast.id).update(last_user_id=first_user.id, delivered=1)
+
+        broadcast = send_broadcast(broadcast.id)
+        self.assertEqual((broadcast.total, broadcast.delivered), (5, 5))
+        self.assertEqual(Notification.objects.filter(user=first_user).count(), 1)
+
+
+class NotificationInboxTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='user@example.com', password='password!123')
+        self.message = NotificationMessage.objects.create(title='Title', body='Body', type='general')
+        self.notification = Notification.objects.create(user=self.user, message=self.message)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_list_and_detail_read_shared_message(self):
+        response = self.client.get(reverse('notification-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            list(response.data['results'][0]),
+            ['id', 'title', 'image', 'type', 'is_read', 'created_at']
+        )
+        self.assertEqual(response.data['results'][0]['title'], 'Title')
+
+        url = reverse('notification-detail', kwargs={'notification_id': self.notification.id})
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual((response.data['id'], response.data['body']), (str(self.notification.id), 'Body'))
+
+
+class NotificationCounterTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='user@example.com', password='password!123')
+        self.message = NotificationMessage.objects.create(title='Title', body='Body', type='general')
+        self.notifications = [Notification.objects.create(user=self.user, message=self.message) for _ in range(3)]
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def summary(self):
+        return self.client.get(reverse('notification-summary')).data
+
+    def test_counts_follow_delivery_and_reads(self):
+        self.assertEqual(self.summary(), {'unread_count': 3, 'total_count': 3})
+
+        url = reverse('notification-read', kwargs={'notification_id': self.notifications[0].id})
+        self.assertEqual(self.client.post(url).data, {'unread_count': 2, 'total_count': 3})
+        self.assertEqual(self.client.post(url).data, {'unread_count': 2, 'total_count': 3})
+
+        self.notifications[1].delete()
+        self.assertEqual(self.summary(), {'unread_count': 1, 'total_count': 2})
+
+        self.assertEqual(self.client.post(reverse('notification-read-all')).data, {'unread_count': 0, 'total_count': 2})
+
+    def test_message_delete_decrements_once(self):
+        other_user = User.objects.create_user(email='other@example.com', password='password!123')
+        Notification.objects.create(user=other_user, message=self.message, is_read=True)
+        other_message = NotificationMessage.objects.create(title='Other', body='Body', type='general')
+        Notification.objects.create(user=other_user, message=other_message)
+        self.client.post(reverse('notification-read', kwargs={'notification_id': self.notifications[0].id}))
+
+        with CaptureQueriesContext(connection) as context:
+            self.message.delete()
+        updates = [query for query in context.captured_queries if query['sql'].startswith('UPDATE "notification_')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(self.summary(), {'unread_count': 0, 'total_count': 0})
+        self.assertEqual(
+            NotificationCounter.objects.values('unread_count', 'total_count').get(user=other_user),
+            {'unread_count': 1, 'total_count': 1}
+        )
+
+    def test_broadcast_counts_and_rebuild(self):
+        broadcast = NotificationBroadcast.objects.create(message=self.message)
+        send_broadcast(broadcast.id)
+        self.assertEqual(self.summary(), {'unread_count': 4, 'total_count': 4})
+
+        NotificationCounter.objects.all().delete()
+        self.assertEqual(self.summary(), {'unread_count': 0, 'total_count': 0})
+        NotificationCounter.objects.rebuild()
+        self.assertEqual(self.summary(), {'unread_count': 4, 'total_count': 4})
+
+    def test_read_pushes_count(self):
+        url = reverse('notification-read', kwargs={'notification_id': self.notifications[0].id})
+        with mock.patch('apps.notification.push.send_to_user') as send_to_user:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(url)
+        send_to_user.assert_called_once_with(
+            self.user.pk, {'type': 'notification.count', 'unread_count': 2, 'total_count': 3}
+        )
+
+
+class NotificationConsumerTests(TransactionTestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='user@example.com', password='password!123')
+        self.message = NotificationMessage.objects.create(title='Title', body='Body', type='general')
+        self.seen = Notification.objects.create(user=self.user, message=self.message)
+        self.missed = Notification.objects.create(user=self.user, message=self.message)
+
+    def communicator(self, path='/ws/notifications/'):
+        communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), path, headers=[(b'host', b'testserver')])
+        communicator.scope['user'] = self.user
+        return communicator
+
+    async def test_catch_up_after_cursor(self):
+        communicator = self.communicator(f'/ws/notifications/?after={self.seen.id}')
+        self.assertTrue((await communicator.connect())[0])
+        response = await communicator.receive_json_from()
+        self.assertEqual((response['type'], response['notification']['id']), ('notification', str(self.missed.id)))
+        response = await communicator.receive_json_from()
+        self.assertEqual(response, {'type': 'count', 'unread_count': 2, 'total_count': 2})
+        self.assertTrue(await communicator.receive_nothing())
+        await communicator.disconnect()
+
+    async def test_unknown_cursor_starts_from_the_latest(self):
+        other_user = await User.objects.acreate(email='other@example.com')
+        other_notification = await Notification.objects.acreate(user=other_user, message=self.message)
+        for after in other_notification.id, 'invalid':
+            communicator = self.communicator(f'/ws/notifications/?after={after}')
+            self.assertTrue((await communicator.connect())[0])
+            self.assertEqual((await communicator.receive_json_from())['type'], 'count')
+            self.assertTrue(await communicator.receive_nothing())
+            await communicator.disconnect()
+
+    async def test_new_notification_is_pushed(self):
+        communicator = self.communicator()
+        await communicator.connect()
+        await communicator.receive_json_from()
+
+        notification = await Notification.objects.acreate(user=self.user, message=self.message)
+        response = await communicator.receive_json_from()
+        self.assertEqual(response['notification']['id'], str(notification.id))
+        self.assertEqual((await communicator.receive_json_from())['unread_count'], 3)
+
+        await database_sync_to_async(Notification.objects.mark_read)(self.user)
+        self.assertEqual(await communicator.receive_json_from(), {'type': 'count', 'unread_count': 0, 'total_count': 3})
+        await communicator.disconnect()
+
+    async def test_broadcast_is_pushed(self):
+        communicator = self.communicator()
+        await communicator.connect()
+        await communicator.receive_json_from()
+
+        broadcast = await NotificationBroadcast.objects.acreate(message=self.message)
+        with mock.patch('apps.notification.consumers.random.uniform', return_value=0) as uniform:
+            await database_sync_to_async(send_broadcast)(broadcast.id)
+            self.assertEqual((await communicator.receive_json_from())['type'], 'notification')
+        uniform.assert_called_once_with(0, 30)
+        self.assertEqual((await communicator.receive_json_from())['unread_count'], 3)
+        await communicator.disconnect()
+
+    async def test_anonymous_is_rejected(self):
+        communicator = self.communicator()
+        communicator.scope['user'] = AnonymousUser()
+        self.assertFalse((await communicator.connect())[0])
@@ -1,9 +1,17 @@
 from django.urls import path
 
-from apps.notification.views import NotificationView, NotificationDetailView
+from apps.notification.views import (
+    NotificationView, NotificationDetailView, NotificationBroadcastDetailView, NotificationReadAllView,
+    NotificationReadView, NotificationSummaryView
+)
 
 urlpatterns = [
     path('notifications/', NotificationView.as_view(), name='notification-list'),
+    path('notifications/summary/', NotificationSummaryView.as_view(), name='notification-summary'),
+    path('notifications/read/', NotificationReadAllView.as_view(), name='notification-read-all'),
     path('notifications/<uuid:notification_id>/', NotificationDetailView.as_view(), name='notification-detail'),
+    path('notifications/<uuid:notification_id>/read/', NotificationReadView.as_view(), name='notification-read'),
+    path('notifications/broadcasts/<uuid:broadcast_id>/', NotificationBroadcastDetailView.as_view(),
+         name='notification-broadcast-detail'),
 ]
 
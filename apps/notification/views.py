@@ -1,43 +1,44 @@
 from django.shortcuts import get_object_or_404
-from drf_spectacular.utils import extend_schema, OpenApiResponse
+from drf_spectacular.utils import extend_schema
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from apps.notification.models import Notification
-from apps.notification.serializers import NotificationSerializer, NotificationListSerializer
-from config.permissons import IsAuth, IsAdminOrAuth
+from apps.notification.models import Notification, NotificationBroadcast, NotificationCounter
+from apps.notification.serializers import (
+    NotificationBroadcastSerializer, NotificationSerializer, NotificationListSerializer, NotificationSummarySerializer
+)
+from config.pagination import CursorPaginationMixin, paginated
+from config.permissons import IsAdmin, IsAuth, IsAdminOrAuth
 
 
-class NotificationView(APIView):
+class NotificationView(CursorPaginationMixin, APIView):
     serializer_class = NotificationListSerializer
     permission_classes = IsAdminOrAuth,
+    ordering = '-created_at', '-id'
 
     @extend_schema(
         tags=['Notification'],
-        responses={200: serializer_class(many=True)},
+        responses={200: paginated(serializer_class)},
         description='Get all notifications for user'
     )
     def get(self, request):
-        notifications = request.user.notifications.all()
-        serializer = self.serializer_class(notifications, many=True, context={'request': request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        notifications = request.user.notifications.select_related('message')
+        page = self.paginate_queryset(notifications)
+        serializer = self.serializer_class(page, many=True, context={'request': request})
+        return self.get_paginated_response(serializer.data)
 
     @extend_schema(
         tags=['Notification'],
-        request=NotificationSerializer,
-        responses={201: OpenApiResponse(description='Notification created successfully and sent all users')},
-        description='Create notification and send to all users'
+        request=NotificationBroadcastSerializer,
+        responses={202: NotificationBroadcastSerializer},
+        description='Create notification and send to all users in the background'
     )
     def post(self, request):
-        serializer = NotificationSerializer(data=request.data, context={'request': request})
-        if serializer.is_valid(raise_exception=True):
-            serializer.save()
-            return Response(
-                {'message': 'Notification created successfully and sent all users'},
-                status=status.HTTP_201_CREATED
-            )
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        serializer = NotificationBroadcastSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
 
 
 class NotificationDetailView(APIView):
@@ -50,6 +51,70 @@ class NotificationDetailView(APIView):
         description='Get notification for user'
     )
     def get(self, request, notification_id):
-        notification = get_object_or_404(Notification, id=notification_id, user=request.user)
+        notification = get_object_or_404(
+            Notification.objects.select_related('message'), id=notification_id, user=request.user
+        )
         serializer = self.serializer_class(notification, context={'request': request})
         return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class NotificationSummaryView(APIView):
+    serializer_class = NotificationSummarySerializer
+    permission_classes = IsAuth,
+
+    @extend_schema(
+        tags=['Notification'],
+        responses={200: serializer_class()},
+        description='Get unread and total notification counts for user'
+    )
+    def get(self, request):
+        serializer = self.serializer_class(NotificationCounter.for_user(request.user))
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class NotificationReadView(APIView):
+    serializer_class = NotificationSummarySerializer
+    permission_classes = IsAuth,
+
+    @extend_schema(
+        tags=['Notification'],
+        request=None,
+        responses={200: serializer_class()},
+        description='Mark notification as read'
+    )
+    def post(self, request, notification_id):
+        notification = get_object_or_404(Notification, id=notification_id, user=request.user)
+        Notification.objects.filter(id=notification.id).mark_read(request.user)
+        serializer = self.serializer_class(NotificationCounter.for_user(request.user))
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class NotificationReadAllView(APIView):
+    serializer_class = NotificationSummarySerializer
+    permission_classes = IsAuth,
+
+    @extend_schema(
+        tags=['Notification'],
+        request=None,
+        responses={200: serializer_class()},
+        description='Mark all notifications of user as read'
+    )
+    def post(self, request):
+        Notification.objects.mark_read(request.user)
+        serializer = self.serializer_class(NotificationCounter.for_user(request.user))
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class NotificationBroadcastDetailView(APIView):
+    serializer_class = NotificationBroadcastSerializer
+    permission_classes = IsAdmin,
+
+    @extend_schema(
+        tags=['Notification'],
+        responses={200: serializer_class()},
+        description='Get the delivery progress of a notification broadcast'
+    )
+    def get(self, request, broadcast_id):
+        broadcast = get_object_or_404(NotificationBroadcast.objects.select_related('message'), id=broadcast_id)
+        serializer = self.serializer_class(broadcast, context={'request': request})
+        return Response(serializer.data, status=status.HTTP_200_OK)
@@ -0,0 +1,15 @@
+# Generated by Django 5.0.4 on 2026-10-18 13:10
+
+import config.utils
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0002_alter_quizgroup_id'),
+    ]
+
+    operations = [
+        config.utils.create_id_sequences('quiz'),
+    ]
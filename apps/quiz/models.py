@@ -1,6 +1,10 @@
 import uuid
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
 from apps.course.models import Course
+from config.cache import invalidate_tags
 from config.utils import CustomIDField, CustomAutoField
 
 
@@ -74,3 +78,16 @@ class QuizChoice(models.Model):
 
     def __str__(self):
         return self.text
+
+
+@receiver(post_save, sender=QuizSolution)
+@receiver(post_delete, sender=QuizSolution)
+@receiver(post_save, sender=QuizGroup)
+@receiver(post_delete, sender=QuizGroup)
+@receiver(post_save, sender=Quiz)
+@receiver(post_delete, sender=Quiz)
+@receiver(post_save, sender=QuizChoice)
+@receiver(post_delete, sender=QuizChoice)
+def quiz_cache_signal(sender, instance, **kwargs):
+    # Lessons embed their quizzes; one version for all quiz tables keeps saves free of lookups.
+    invalidate_tags('quizzes')
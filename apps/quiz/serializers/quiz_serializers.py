@@ -2,6 +2,7 @@ from django.shortcuts import get_object_or_404
 from rest_framework import serializers
 from apps.quiz.models import Quiz, QuizChoice, QuizSolution
 from apps.quiz.serializers.solution_serializers import QuizSolutionSerializer
+from config.utils import reserve_ids
 
 
 class QuizChoiceSerializser(serializers.ModelSerializer):
@@ -24,8 +25,7 @@ class QuizSerializer(serializers.ModelSerializer):
         solution = get_object_or_404(QuizSolution, id=solution_id)
         choices_data = validated_data.pop('choices')
         quiz = Quiz.objects.create(solution=solution, **validated_data)
-        for choice_data in choices_data:
-            QuizChoice.objects.create(quiz=quiz, **choice_data)
+        self.create_choices(quiz, choices_data)
         return quiz
     
     def update(self, instance, validated_data):
@@ -36,10 +36,14 @@ class QuizSerializer(serializers.ModelSerializer):
             instance.solution = solution
         if choices_data is not None:
             instance.choices.all().delete()
-            for choice_data in choices_data:
-                QuizChoice.objects.create(quiz=instance, **choice_data)
+            self.create_choices(instance, choices_data)
         return super().update(instance, validated_data)
 
+    @staticmethod
+    def create_choices(quiz, choices_data):
+        reserve_ids(QuizChoice, len(choices_data))
+        QuizChoice.objects.bulk_create([QuizChoice(quiz=quiz, **choice_data) for choice_data in choices_data])
+
 
 class QuizListSerializer(serializers.ModelSerializer):
     
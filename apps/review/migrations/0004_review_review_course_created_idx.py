@@ -0,0 +1,20 @@
+# Generated by Django 5.0.4 on 2026-10-18 13:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0010_alter_course_created_at'),
+        ('review', '0003_alter_review_comment'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['course', 'created_at'], name='review_course_created_idx'),
+        ),
+    ]
@@ -1,9 +1,12 @@
 import uuid
 from django.db import models
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 from rest_framework.exceptions import ValidationError
 
 from apps.accounts.models import User
-from apps.course.models import Course
+from apps.course.models import Course, CourseStats
+from config.cache import invalidate_tags
 
 
 class Review(models.Model):
@@ -24,6 +27,7 @@ class Review(models.Model):
         verbose_name_plural = 'reviews'
         ordering = ['created_at']
         unique_together = ('course', 'user')
+        indexes = [models.Index(fields=['course', 'created_at'], name='review_course_created_idx')]
 
     def clean(self):
         if self.rating < 1 or self.rating > 5:
@@ -31,3 +35,22 @@ class Review(models.Model):
 
     def __str__(self):
         return '{}: {} - {}'.format(self.user, self.course, self.rating)
+
+
+@receiver(post_save, sender=Review)
+def review_stats_save_signal(sender, instance, created, **kwargs):
+    if created:
+        CourseStats.objects.increment(instance.course_id, review_count=1, rating_sum=instance.rating)
+    else:
+        CourseStats.objects.refresh_reviews(instance.course_id)
+
+
+@receiver(post_delete, sender=Review)
+def review_stats_delete_signal(sender, instance, **kwargs):
+    CourseStats.objects.increment(instance.course_id, review_count=-1, rating_sum=-instance.rating)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def review_cache_signal(sender, instance, **kwargs):
+    invalidate_tags('courses', f'course:{instance.course_id}')
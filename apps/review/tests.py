@@ -61,8 +61,8 @@ class ReviewTests(APITestCase):
         url = reverse('course-reviews-list', kwargs={'course_id': self.course.id})
         response = self.client.get(url, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['comment'], 'Nice course!')
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['comment'], 'Nice course!')
 
     def test_update_review(self):
         review = Review.objects.create(course=self.course, user=self.user, comment='Nice course!', rating=4)
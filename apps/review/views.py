@@ -7,18 +7,21 @@ from rest_framework.views import APIView
 
 from apps.review.models import Review
 from apps.review.serializers import ReviewSerializer
+from config.pagination import CursorPaginationMixin, paginated
 from config.permissons import IsAuth, IsAuthor
 
 
-class ReviewList(APIView):
+class ReviewList(CursorPaginationMixin, APIView):
     serializer_class = ReviewSerializer
     permission_classes = IsAuthenticatedOrReadOnly,
+    ordering = 'created_at', 'id'
 
-    @extend_schema(tags=['Review'], responses={200: serializer_class(many=True)})
+    @extend_schema(tags=['Review'], responses={200: paginated(serializer_class)})
     def get(self, request, course_id):
-        reviews = Review.objects.filter(course__id=course_id)
-        serializer = self.serializer_class(reviews, many=True, context={'request': request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        reviews = Review.objects.filter(course__id=course_id).select_related('user')
+        page = self.paginate_queryset(reviews)
+        serializer = self.serializer_class(page, many=True, context={'request': request})
+        return self.get_paginated_response(serializer.data)
 
     @extend_schema(tags=['Review'], request=serializer_class(), responses={201: serializer_class()})
     def post(self, request, course_id):
@@ -0,0 +1,202 @@
+import functools
+import hashlib
+import json
+import math
+import time
+import uuid
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+RESPONSE_CACHE_ALIAS = 'responses'
+RESPONSE_CACHE_TIMEOUT = 300
+
+
+def tag_key(tag):
+    return f'response-version:{tag}'
+
+
+def new_version():
+    """A tag version: when it was set, and a token unique to this change."""
+    return time.time(), uuid.uuid4().hex
+
+
+class ResponseCache:
+    """
+    Rendered responses stored with the versions of the tags they depend on.
+
+    A tag is any name of a set of rows, such as ``courses`` or ``course:<id>``.
+    Invalidating a tag gives it a new version, which turns every entry stored
+    with the old one into a miss. Entries also expire after ``timeout``. The
+    versions double as the validators of ``conditional_response``.
+    """
+
+    def __init__(self, alias, timeout):
+        self.alias = alias
+        self.timeout = timeout
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    @staticmethod
+    def key(request):
+        query = sorted((name, value) for name, values in request.query_params.lists() for value in values)
+        url = '{}?{}|{}'.format(request.build_absolute_uri(request.path), urlencode(query), request.accepted_media_type)
+        return 'response:' + hashlib.md5(url.encode()).hexdigest()
+
+    def get(self, key):
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        content, versions = entry
+        if self.cache.get_many([tag_key(tag) for tag in versions]) != {
+            tag_key(tag): version for tag, version in versions.items()
+        }:
+            return None
+        return content
+
+    def get_versions(self, tags):
+        """Current versions of ``tags``, read before rendering so that a concurrent invalidation wins."""
+        keys = {tag_key(tag): tag for tag in tags}
+        versions = self.cache.get_many(keys)
+        for key in keys.keys() - versions.keys():
+            version = new_version()
+            if not self.cache.add(key, version, timeout=None):
+                version = self.cache.get(key, version)
+            versions[key] = version
+        return {tag: versions[key] for key, tag in keys.items()}
+
+    def set(self, key, content, versions):
+        self.cache.set(key, (content, versions), self.timeout)
+
+    def invalidate(self, tags):
+        self.cache.set_many({tag_key(tag): new_version() for tag in tags}, timeout=None)
+
+
+response_cache = ResponseCache(
+    alias=getattr(settings, 'RESPONSE_CACHE_ALIAS', RESPONSE_CACHE_ALIAS),
+    timeout=getattr(settings, 'RESPONSE_CACHE_TIMEOUT', RESPONSE_CACHE_TIMEOUT),
+)
+
+
+def invalidate_tags(*tags):
+    """
+    Invalidate the cached responses depending on ``tags``, now and again when
+    the transaction commits, so a response rendered in between is not kept.
+    """
+    response_cache.invalidate(tags)
+    transaction.on_commit(lambda: response_cache.invalidate(tags))
+
+
+def cache_response(*tags, overlay=None, private_params=()):
+    """
+    Serve the successful JSON responses of a ``get`` handler from
+    ``response_cache``. Tags may use the URL keyword arguments, such as
+    ``'course:{course_id}'``.
+
+    The cached payload is the one an anonymous user gets. Authenticated users
+    are served from it too when the handler has an ``overlay``, called as
+    ``overlay(request, data)`` to add their own fields to a copy of the
+    payload, unless the query uses one of ``private_params``.
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            authenticated = request.user.is_authenticated
+            if request.accepted_renderer.format != 'json' or authenticated and (
+                overlay is None or any(param in request.query_params for param in private_params)
+            ):
+                return method(view, request, *args, **kwargs)
+
+            key = response_cache.key(request)
+            content = response_cache.get(key)
+            if content is None:
+                versions = response_cache.get_versions(tag.format(**kwargs) for tag in tags)
+                user = request.user
+                request.user = AnonymousUser()
+                try:
+                    response = method(view, request, *args, **kwargs)
+                finally:
+                    request.user = user
+                if response.status_code != status.HTTP_200_OK:
+                    return response
+                content = request.accepted_renderer.render(response.data, request.accepted_media_type, {
+                    'request': request, 'response': response, 'view': view
+                })
+                response_cache.set(key, content, versions)
+
+            if not authenticated:
+                return HttpResponse(content, content_type=request.accepted_renderer.media_type)
+            data = json.loads(content)
+            overlay(request, data)
+            return Response(data)
+
+        return wrapper
+
+    return decorator
+
+
+def conditional_response(*tags, user_tags=(), lookup=None):
+    """
+    Give the successful responses of a ``get`` handler a strong ``ETag`` and a
+    ``Last-Modified`` date taken from the versions of ``tags``, and answer
+    ``If-None-Match`` and ``If-Modified-Since`` with 304 without calling the
+    handler when nothing changed. ``Last-Modified`` is rounded up to the next
+    second and only sent once that second is over.
+
+    Authenticated users also depend on ``user_tags``, which may use
+    ``{user_id}``. ``lookup(**kwargs)`` returns more tag arguments, such as the
+    course of a section, or ``None`` to leave the request to the handler.
+
+    Nothing is done unless ``CONDITIONAL_RESPONSES`` is set, which requires a
+    ``responses`` cache shared by all workers.
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            if not getattr(settings, 'CONDITIONAL_RESPONSES', False):
+                return method(view, request, *args, **kwargs)
+            arguments = dict(kwargs)
+            if lookup is not None:
+                extra = lookup(**kwargs)
+                if extra is None:
+                    return method(view, request, *args, **kwargs)
+                arguments.update(extra)
+            all_tags = list(tags)
+            if request.user.is_authenticated:
+                arguments['user_id'] = request.user.pk
+                all_tags.extend(user_tags)
+
+            versions = response_cache.get_versions(tag.format(**arguments) for tag in all_tags)
+            validator = repr((response_cache.key(request), arguments.get('user_id'), sorted(versions.items())))
+            etag = quote_etag(hashlib.md5(validator.encode()).hexdigest())
+            last_modified = math.ceil(max(timestamp for timestamp, _ in versions.values()))
+            if last_modified > time.time():
+                # Another change could still land in this second and share the date.
+                last_modified = None
+
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = method(view, request, *args, **kwargs)
+                if response.status_code != status.HTTP_200_OK:
+                    return response
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+            patch_vary_headers(response, ['Authorization'])
+            return response
+
+        return wrapper
+
+    return decorator
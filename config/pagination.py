@@ -0,0 +1,50 @@
+from drf_spectacular.utils import inline_serializer
+from rest_framework import pagination, serializers
+from rest_framework.response import Response
+
+
+class CursorPagination(pagination.CursorPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = '-created_at'
+
+
+class CursorPaginationMixin:
+    """
+    Keyset pagination for ``APIView`` list endpoints.
+
+    Views set ``ordering`` to the indexed columns of their list, and call
+    ``paginate_queryset`` and ``get_paginated_response`` like a generic view.
+    """
+    pagination_class = CursorPagination
+    ordering = '-created_at'
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            self._paginator = self.pagination_class()
+            self._paginator.ordering = self.ordering
+        return self._paginator
+
+    def paginate_queryset(self, queryset):
+        if queryset.query.is_sliced:
+            return queryset
+        return self.paginator.paginate_queryset(queryset, self.request, view=self)
+
+    def get_paginated_response(self, data):
+        if not hasattr(self.paginator, 'page'):
+            return Response({'next': None, 'previous': None, 'results': data})
+        return self.paginator.get_paginated_response(data)
+
+
+def paginated(serializer_class):
+    """Schema of a cursor paginated list of ``serializer_class``."""
+    return inline_serializer(
+        name='Paginated{}'.format(serializer_class.__name__.replace('Serializer', '')),
+        fields={
+            'next': serializers.URLField(allow_null=True),
+            'previous': serializers.URLField(allow_null=True),
+            'results': serializer_class(many=True),
+        }
+    )
@@ -8,24 +8,24 @@ class IsAuth(BasePermission):
 
 class IsAdmin(BasePermission):
     def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.groups.filter(name='admin').exists()
+        return request.user.is_authenticated and 'admin' in request.user.roles
     
 
 class IsAdminOrReadOnly(BasePermission):
     def has_permission(self, request, view):
         return (request.method in SAFE_METHODS or request.user.is_authenticated and
-                request.user.groups.filter(name='admin').exists())
+                'admin' in request.user.roles)
 
 
 class IsAdminOrAuth(BasePermission):
     def has_permission(self, request, view):
         return (request.user.is_authenticated and
-                (request.method in SAFE_METHODS or request.user.groups.filter(name='admin').exists()))
+                (request.method in SAFE_METHODS or 'admin' in request.user.roles))
 
 
 class IsTeacher(BasePermission):
     def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.groups.filter(name='teacher').exists()
+        return request.user.is_authenticated and 'teacher' in request.user.roles
 
 
 class IsAuthor(BasePermission):
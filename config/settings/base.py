@@ -68,6 +68,23 @@ TEMPLATES = [
 WSGI_APPLICATION = 'config.wsgi.application'
 ASGI_APPLICATION = 'config.asgi.application'
 
+AUTHENTICATION_BACKENDS = [
+    'apps.accounts.backends.EmailOrPhoneBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
+PASSWORD_HASHERS = [
+    'apps.accounts.backends.ConfigurablePBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+PASSWORD_HASHER_ITERATIONS = config('PASSWORD_HASHER_ITERATIONS', default=720000, cast=int)
+
+LAST_LOGIN_UPDATE_INTERVAL = timedelta(minutes=config('LAST_LOGIN_UPDATE_MINUTES', default=60, cast=int))
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -108,7 +125,7 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.DjangoModelPermissionsOrAnonReadOnly'
     ),
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.accounts.authentication.StatelessJWTAuthentication',
     ),
     'DATETIME_FORMAT': "%Y-%m-%d %H:%M:%S",
 }
@@ -138,8 +155,51 @@ SPECTACULAR_SETTINGS = {
     'COMPONENT_SPLIT_REQUEST': True
 }
 
-CHANNEL_LAYERS = {
-    'default': {
-        'BACKEND': 'channels.layers.InMemoryChannelLayer',
-    },
-}
+# Without REDIS_URL every process has its own in-memory cache and channel
+# layer, which is only suitable for a single worker and for tests.
+REDIS_URL = config('REDIS_URL', default=None)
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': config('CHANNEL_LAYER_PREFIX', default='online-education'),
+        },
+        'responses': {
+            'BACKEND': config('RESPONSE_CACHE_BACKEND', default='django.core.cache.backends.redis.RedisCache'),
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': config('CHANNEL_LAYER_PREFIX', default='online-education'),
+        },
+    }
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': config('CHANNEL_LAYER_BACKEND', default='channels_redis.pubsub.RedisPubSubChannelLayer'),
+            'CONFIG': {
+                'hosts': [REDIS_URL],
+                'prefix': config('CHANNEL_LAYER_PREFIX', default='online-education'),
+            },
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+        'responses': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'responses',
+        },
+    }
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels.layers.InMemoryChannelLayer',
+        },
+    }
+
+# Anonymous catalog responses are cached in the 'responses' cache for this many seconds at most.
+RESPONSE_CACHE_TIMEOUT = config('RESPONSE_CACHE_TIMEOUT', default=300, cast=int)
+# ETags are derived from the tag versions in the 'responses' cache, so they
+# need a cache shared by all workers; a process-local one would answer 304
+# for content changed on another worker.
+CONDITIONAL_RESPONSES = config('CONDITIONAL_RESPONSES', default=bool(REDIS_URL), cast=bool)
@@ -1,39 +1,166 @@
-from django.db import models
+import os
+import threading
+from collections import deque
+
+from django.db import connections, migrations, models, router
+from django.db.models import Max
+from django.db.models.functions import Cast
 from rest_framework import serializers
 
 
-class CustomIDField(models.CharField):
+class SequenceIDMixin:
+    """
+    Primary key filled from a PostgreSQL sequence named after the table.
+
+    Each insert takes the next value of the sequence, so concurrent inserts
+    never collide and ids follow the creation order. ``reserve_ids`` fetches
+    the ids of a bulk creation in one query. The sequences are created by
+    ``create_id_sequences`` migrations. On other databases the next id is read
+    from the table as before.
+    """
+
+    start_id = 1
 
     def __init__(self, *args, **kwargs):
-        kwargs['max_length'] = 6
         super().__init__(*args, **kwargs)
+        self._id_pools = {}
+        self._last_issued_ids = {}
+        self._id_lock = threading.Lock()
+
+    def get_default(self):
+        return None
 
     def pre_save(self, model_instance, add):
-        if add:
-            last_instance = model_instance.__class__.objects.order_by('-id').first()
-            if last_instance:
-                value = '{:05}'.format(int(last_instance.id) + 1)
-            else:
-                value = '00001'
-            setattr(model_instance, self.attname, value)
+        # Filled in on insert rather than in get_pk_value_on_save, so that
+        # saving a new instance does not try an UPDATE first.
+        if add and not getattr(model_instance, self.attname):
+            setattr(model_instance, self.attname, self.format_id(self.next_id(model_instance)))
         return super().pre_save(model_instance, add)
 
+    def format_id(self, value):
+        return value
+
+    def first_id(self, last_id):
+        """The first id to issue after ``last_id``, the largest one in the table."""
+        return max(last_id + 1, self.start_id) if last_id else self.start_id
+
+    @property
+    def sequence_name(self) -> str:
+        return '{}_{}_custom_seq'.format(self.model._meta.db_table, self.column)
+
+    def next_id(self, model_instance) -> int:
+        using = model_instance._state.db or router.db_for_write(self.model, instance=model_instance)
+        with self._id_lock:
+            if connections[using].vendor != 'postgresql':
+                return self._next_table_id(using)
+
+            pool = self._get_pool(using)
+            if not pool:
+                pool.extend(self._fetch_ids(using, 1))
+            return pool.popleft()
 
-class CustomAutoField(models.PositiveIntegerField):
+    def reserve_ids(self, count, using=None):
+        """Reserve at least ``count`` ids with one query, ahead of a bulk creation."""
+        using = using or router.db_for_write(self.model)
+        if connections[using].vendor != 'postgresql':
+            return
+        with self._id_lock:
+            pool = self._get_pool(using)
+            if len(pool) < count:
+                pool.extend(self._fetch_ids(using, count - len(pool)))
+
+    def last_id(self, using):
+        ids = self.model._default_manager.using(using).annotate(
+            _int_id=Cast(self.attname, models.BigIntegerField())
+        ).aggregate(last_id=Max('_int_id'))
+        return ids['last_id']
+
+    def create_sequence(self, connection):
+        quote_name = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            cursor.execute('CREATE SEQUENCE IF NOT EXISTS {}'.format(quote_name(self.sequence_name)))
+            cursor.execute('SELECT setval(%s, %s, false)', [
+                self.sequence_name, self.first_id(self.last_id(connection.alias))
+            ])
+
+    def drop_sequence(self, connection):
+        with connection.cursor() as cursor:
+            cursor.execute('DROP SEQUENCE IF EXISTS {}'.format(connection.ops.quote_name(self.sequence_name)))
+
+    def _get_pool(self, using):
+        key = (using, self.sequence_name)
+        pid, pool = self._id_pools.get(key, (None, None))
+        if pid != os.getpid():
+            pool = deque()
+            self._id_pools[key] = (os.getpid(), pool)
+        return pool
+
+    def _next_table_id(self, using):
+        key = (using, self.sequence_name)
+        value = self.first_id(self.last_id(using))
+        if key in self._last_issued_ids:
+            value = max(value, self._last_issued_ids[key] + 1)
+        self._last_issued_ids[key] = value
+        return value
+
+    def _fetch_ids(self, using, count):
+        with connections[using].cursor() as cursor:
+            cursor.execute('SELECT nextval(%s) FROM generate_series(1, %s)', [self.sequence_name, count])
+            return [row[0] for row in cursor.fetchall()]
+
+
+class CustomIDField(SequenceIDMixin, models.CharField):
+
+    def __init__(self, *args, **kwargs):
+        kwargs['max_length'] = 6
+        super().__init__(*args, **kwargs)
+
+    def format_id(self, value):
+        return '{:05}'.format(value)
+
+
+class CustomAutoField(SequenceIDMixin, models.PositiveIntegerField):
 
     def __init__(self, *args, **kwargs):
         self.start_id = kwargs.pop('start_id', 10 ** 9 + 1)
         super().__init__(*args, **kwargs)
 
-    def pre_save(self, model_instance, add):
-        if add:
-            last_instance = model_instance.__class__.objects.order_by('-id').first()
-            if last_instance:
-                value = max(int(last_instance.id) + 1, self.start_id)
-            else:
-                value = 10 ** 9 + 1
-            setattr(model_instance, self.attname, value)
-        return super().pre_save(model_instance, add)
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.start_id != 10 ** 9 + 1:
+            kwargs['start_id'] = self.start_id
+        return name, path, args, kwargs
+
+    def first_id(self, last_id):
+        if last_id:
+            return max(last_id + 1, self.start_id)
+        return 10 ** 9 + 1
+
+
+def reserve_ids(model, count, using=None):
+    """Reserve ``count`` ids of a model whose primary key is a ``SequenceIDMixin`` field."""
+    model._meta.pk.reserve_ids(count, using=using)
+
+
+def create_id_sequences(app_label):
+    """Return a migration operation creating the id sequences of the models of an app."""
+
+    def sequence_fields(apps):
+        for model in apps.get_app_config(app_label).get_models():
+            if isinstance(model._meta.pk, SequenceIDMixin):
+                yield model._meta.pk
+
+    def create_sequences(apps, schema_editor):
+        if schema_editor.connection.vendor == 'postgresql':
+            for field in sequence_fields(apps):
+                field.create_sequence(schema_editor.connection)
+
+    def drop_sequences(apps, schema_editor):
+        if schema_editor.connection.vendor == 'postgresql':
+            for field in sequence_fields(apps):
+                field.drop_sequence(schema_editor.connection)
+
+    return migrations.RunPython(create_sequences, drop_sequences)
 
 
 class TimestampField(serializers.IntegerField):